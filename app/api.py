@@ -0,0 +1,138 @@
+"""
+Read-only JSON API over the latest snapshot.
+
+    GET /api/snapshot                   version, refresh time, per-source status and counts, top ideas
+    GET /api/sources/{name}             items of one source (cache key, e.g. hn_stories)
+    GET /api/ideas                      every generated idea as {"source", "idea"}, plus the top ideas
+
+List endpoints take ?limit= (default 50, max 500), ?cursor= (the next_cursor of the
+previous page) and ?fields=title,url to keep only some item fields. Cursors are
+bound to a snapshot version; once a refresh publishes a new one, old cursors get
+a 409 and the client starts over.
+
+Each distinct response is serialized and compressed once per snapshot version.
+"""
+import base64
+import binascii
+import hashlib
+
+from fastapi import APIRouter, HTTPException, Request
+
+from app.cache_utils import load_snapshot
+from app.ideas import IDEA_SOURCES, load_idea_snapshot
+from app.responses import VersionedCache, dumps, encode_variants, send
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+router = APIRouter(prefix="/api")
+_cache = VersionedCache()
+
+
+def _snapshot():
+    version, cache = load_snapshot()
+    if not cache:
+        raise HTTPException(status_code=503, detail="No snapshot yet, the first refresh is running",
+                            headers={"Retry-After": "5"})
+    return version, cache
+
+
+def encode_cursor(version, offset):
+    return base64.urlsafe_b64encode(f"{version}:{offset}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, version):
+    if not cursor:
+        return 0
+    try:
+        cursor_version, offset = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode().split(":")
+        cursor_version, offset = int(cursor_version), int(offset)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if offset < 0:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if cursor_version != version:
+        raise HTTPException(status_code=409, detail="The snapshot changed since this cursor was issued; start over")
+    return offset
+
+
+def _select(item, fields):
+    if not fields or not isinstance(item, dict):
+        return item
+    return {field: item[field] for field in fields if field in item}
+
+
+def _page(version, items, cursor, limit, fields):
+    offset = decode_cursor(cursor, version)
+    page = items[offset:offset + limit]
+    next_offset = offset + len(page)
+    return {
+        "version": version,
+        "items": [_select(item, fields) for item in page],
+        "next_cursor": encode_cursor(version, next_offset) if next_offset < len(items) else None,
+        "total": len(items),
+    }
+
+
+def _fields(fields):
+    return tuple(sorted({f.strip() for f in fields.split(",") if f.strip()})) if fields else ()
+
+
+def _respond(request, version, key, build):
+    """Serves the response for `key`, building and compressing it only once per snapshot version."""
+    variants = _cache.get(version, key, lambda: encode_variants(dumps(build())))
+    etag = f"api-{version}-{hashlib.blake2b(repr(key).encode(), digest_size=6).hexdigest()}"
+    return send(request, variants, etag, "application/json")
+
+
+@router.get("/snapshot")
+def api_snapshot(request: Request, fields: str = None):
+    version, cache = _snapshot()
+    selected = _fields(fields)
+
+    def build():
+        idea_snapshot = load_idea_snapshot(cache) or {}
+        status = cache.get("source_status", {})
+        body = {
+            "version": version,
+            "refreshed_at": cache.get("refreshed_at"),
+            "sources": {
+                key: {"name": name, "count": len(cache.get(key, [])), **status.get(key, {})}
+                for key, name in IDEA_SOURCES
+            },
+            "best_ideas": idea_snapshot.get("best_ideas", []),
+            "ideas_generated_at": idea_snapshot.get("generated_at"),
+        }
+        return _select(body, selected)
+
+    return _respond(request, version, ("snapshot", selected), build)
+
+
+@router.get("/sources/{name}")
+def api_source(request: Request, name: str, cursor: str = None, limit: int = DEFAULT_LIMIT, fields: str = None):
+    if name not in dict(IDEA_SOURCES):
+        raise HTTPException(status_code=404, detail=f"Unknown source {name!r}")
+    version, cache = _snapshot()
+    limit = max(1, min(limit, MAX_LIMIT))
+    selected = _fields(fields)
+
+    def build():
+        return {"source": name, **_page(version, cache.get(name, []), cursor, limit, selected)}
+
+    return _respond(request, version, ("source", name, cursor, limit, selected), build)
+
+
+@router.get("/ideas")
+def api_ideas(request: Request, cursor: str = None, limit: int = DEFAULT_LIMIT, fields: str = None):
+    version, cache = _snapshot()
+    limit = max(1, min(limit, MAX_LIMIT))
+    selected = _fields(fields)
+
+    def build():
+        idea_snapshot = load_idea_snapshot(cache) or {}
+        per_source = idea_snapshot.get("per_source", {})
+        ideas = [{"source": key, "idea": idea} for key, _ in IDEA_SOURCES for idea in per_source.get(key, [])]
+        ideas += [{"source": "combined", "idea": idea} for idea in idea_snapshot.get("combined", [])]
+        return {"best_ideas": idea_snapshot.get("best_ideas", []), **_page(version, ideas, cursor, limit, selected)}
+
+    return _respond(request, version, ("ideas", cursor, limit, selected), build)
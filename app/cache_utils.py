@@ -1,14 +1,52 @@
-import json
-from pathlib import Path
+import threading
 
-CACHE_FILE = Path(__file__).parent / "latest_results.json"
+from app.snapshot_store import SnapshotStore
+from config import SNAPSHOT_DB_PATH, SNAPSHOT_LEGACY_JSON
+from metrics import SNAPSHOT_CACHE, SNAPSHOT_LOAD_SECONDS
+
+store = SnapshotStore(SNAPSHOT_DB_PATH, legacy_json=SNAPSHOT_LEGACY_JSON or None)
 
 def save_results(data):
-    with open(CACHE_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    return store.publish(data)
 
 def load_results():
-    if not CACHE_FILE.exists():
-        return None
-    with open(CACHE_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return store.load()
+
+
+class SnapshotCache:
+    """
+    Keeps the latest snapshot in memory and reloads it only when the store changed.
+    A stat of the database files is enough on the hot path; the version query
+    only runs when the files were touched.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.version = None
+        self.data = None
+        self._signature = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Returns (version, snapshot); the snapshot is shared, callers must not mutate it."""
+        signature = self.store.file_signature()
+        if signature == self._signature and self.version is not None:
+            SNAPSHOT_CACHE.inc(result="hit")
+            return self.version, self.data
+        with self._lock:
+            reloaded = False
+            if signature != self._signature or self.version is None:
+                version = self.store.current_version()
+                if version != self.version:
+                    with SNAPSHOT_LOAD_SECONDS.time():
+                        self.data = self.store.load()
+                    self.version = version
+                    reloaded = True
+                self._signature = signature
+            SNAPSHOT_CACHE.inc(result="reload" if reloaded else "hit")
+            return self.version, self.data
+
+snapshot_cache = SnapshotCache(store)
+
+def load_snapshot():
+    return snapshot_cache.get()
@@ -0,0 +1,96 @@
+import hashlib
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from app.ideas import IDEA_SOURCES, is_error_result
+
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+
+
+def safe_url(url):
+    """Only http(s) links reach the page; anything else (javascript:, data:, missing) becomes "#"."""
+    if isinstance(url, str) and urlsplit(url.strip()).scheme.lower() in ("http", "https"):
+        return url.strip()
+    return "#"
+
+
+# Templates are compiled once, at import; autoescape covers titles, ideas and every other fetched string
+env = Environment(
+    loader=FileSystemLoader(TEMPLATES_DIR),
+    autoescape=select_autoescape(["html"]),
+    auto_reload=False,
+)
+env.filters["safe_url"] = safe_url
+DASHBOARD = env.get_template("dashboard.html")
+PLACEHOLDER = env.get_template("placeholder.html")
+_macros = DASHBOARD.module
+
+# Changes whenever a template does, so ETags of pages rendered by an older deploy stop matching
+TEMPLATE_HASH = hashlib.blake2b(
+    b"".join(path.read_bytes() for path in sorted(TEMPLATES_DIR.glob("*.html"))), digest_size=4
+).hexdigest()
+
+# Per-source section settings: (element id suffix, icon); item markup lives in dashboard.html
+SECTION_STYLES = {
+    "reddit_posts": ("reddit", "👽"),
+    "hn_stories": ("hn", "📰"),
+    "devto_articles": ("devto", "📝"),
+    "lobsters_stories": ("lobsters", "🦞"),
+    "github_trending": ("github", "💻"),
+    "dribbble_shots": ("dribbble", "🎨"),
+    "techcrunch_articles": ("techcrunch", "📰"),
+    "trends": ("trends", "🌐"),
+}
+
+
+def _section(key, name, order, items, ideas, pending=False):
+    section_id, icon = SECTION_STYLES[key]
+    return {
+        "key": key, "name": name, "order": order, "section_id": section_id, "icon": icon,
+        "items": items, "ideas": ideas, "error": is_error_result(items), "pending": pending,
+    }
+
+
+def render_placeholder():
+    """First-boot page, shown while the initial refresh runs; reloads itself until the snapshot exists."""
+    return PLACEHOLDER.render(sections=[_section(key, name, order, [], [])
+                                        for order, (key, name) in enumerate(IDEA_SOURCES)])
+
+
+def render_section(key, name, order, items, ideas, pending=False):
+    """
+    Renders one source block. `order` keeps page order when sections are streamed out of order;
+    `pending` shows a placeholder until the refresh has generated the section's ideas.
+    """
+    return str(_macros.section(_section(key, name, order, items, ideas, pending)))
+
+
+def render_dashboard(cache, idea_snapshot):
+    """Renders the whole page in one go; ideas missing from the snapshot show as placeholders."""
+    per_source = idea_snapshot.get("per_source", {})
+    return DASHBOARD.render(
+        refreshed_at=cache.get("refreshed_at"),
+        best_ideas=idea_snapshot.get("best_ideas", []),
+        ideas_pending=not idea_snapshot,
+        sections=[_section(key, name, order, cache.get(key, []), per_source.get(key, []),
+                           pending=key not in per_source and not is_error_result(cache.get(key, [])))
+                  for order, (key, name) in enumerate(IDEA_SOURCES)],
+    )
+
+
+def stream_dashboard(cache, idea_snapshot):
+    """
+    Yields the page in chunks: head and "Top 5" first, then each source section.
+    Sections whose ideas aren't in the snapshot show a placeholder; ideas only
+    come from the refresh.
+    """
+    per_source = idea_snapshot.get("per_source", {})
+    yield (str(_macros.page_head()) + str(_macros.snapshot_age(cache.get("refreshed_at")))
+           + str(_macros.best_ideas_block(idea_snapshot.get("best_ideas", []), not idea_snapshot)))
+    for order, (key, name) in enumerate(IDEA_SOURCES):
+        items = cache.get(key, [])
+        pending = key not in per_source and not is_error_result(items)
+        yield render_section(key, name, order, items, per_source.get(key, []), pending)
+    yield str(_macros.page_tail())
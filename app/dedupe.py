@@ -0,0 +1,154 @@
+"""
+Cross-source near-duplicate detection, run between fetching and prompting.
+
+Two items are the same story if their canonical URLs match, or if the SimHash
+of their title + description differs in at most MAX_DISTANCE bits. Candidate
+pairs come from banded LSH buckets (the 64-bit hash cut into MAX_DISTANCE + 1
+bands: by pigeonhole, near-duplicates share at least one band exactly), so the
+whole pass stays close to linear in the number of items.
+
+Each cluster keeps its most engaging item, compared relative to the top item of
+its own source (stars, upvotes and points aren't on the same scale); it carries
+the summed engagement of the cluster and the names of the other sources it was
+seen on.
+"""
+import hashlib
+import math
+import re
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from llm.prompt_packer import engagement
+
+HASH_BITS = 64
+MAX_DISTANCE = 3
+BANDS = MAX_DISTANCE + 1
+BAND_BITS = HASH_BITS // BANDS
+MIN_TOKENS = 3  # shorter titles (e.g. single search terms) are only matched by URL
+
+TRACKING_PARAMS = {"ref", "ref_src", "source", "fbclid", "gclid", "mc_cid", "mc_eid", "guccounter"}
+TITLE_PREFIXES = re.compile(r"^(show|ask|tell|launch) hn:\s*", re.IGNORECASE)
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = {"a", "an", "the", "of", "to", "in", "on", "for", "and", "or", "is", "are", "with", "your", "you", "how", "what", "why"}
+
+
+def canonical_url(url):
+    """Normalizes a URL so trivially different links to the same page compare equal."""
+    if not url or "://" not in url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if host.startswith("m."):
+        host = host[2:]
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    )
+    path = re.sub(r"/(amp/?)?$", "", parts.path) or "/"
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def tokenize(text):
+    """Lower-cased word tokens of `text`, without stopwords."""
+    return [t for t in TOKEN_RE.findall((text or "").lower()) if t not in STOPWORDS]
+
+
+def _tokens(item):
+    return tokenize(TITLE_PREFIXES.sub("", item.get("title", "")) + " " + (item.get("description") or "")[:200])
+
+
+def simhash(tokens):
+    """64-bit SimHash over word unigrams and bigrams."""
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    weights = [0] * HASH_BITS
+    for feature in features:
+        h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(HASH_BITS):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit in range(HASH_BITS) if weights[bit] > 0)
+
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def _union(parent, a, b):
+    ra, rb = _find(parent, a), _find(parent, b)
+    if ra != rb:
+        parent[rb] = ra
+
+
+def cluster(items):
+    """Groups item indexes into near-duplicate clusters. Returns a list of index lists."""
+    parent = list(range(len(items)))
+    by_url = {}
+    buckets = {}
+    hashes = {}
+    for i, item in enumerate(items):
+        url = canonical_url(item.get("url", ""))
+        if url:
+            if url in by_url:
+                _union(parent, by_url[url], i)
+            else:
+                by_url[url] = i
+        tokens = _tokens(item)
+        if len(tokens) < MIN_TOKENS:
+            continue
+        h = hashes[i] = simhash(tokens)
+        for band in range(BANDS):
+            key = (band, h >> (band * BAND_BITS) & ((1 << BAND_BITS) - 1))
+            for j in buckets.get(key, ()):
+                if bin(h ^ hashes[j]).count("1") <= MAX_DISTANCE:
+                    _union(parent, j, i)
+            buckets.setdefault(key, []).append(i)
+    clusters = {}
+    for i in range(len(items)):
+        clusters.setdefault(_find(parent, i), []).append(i)
+    return list(clusters.values())
+
+
+def dedupe_sources(results, sources):
+    """
+    Removes cross-source duplicates from `results` before prompting.
+    sources: [(cache key, display name)] to consider
+    Returns a new {cache key: [items]} where every duplicate cluster is kept once,
+    in the source of its most engaging item, with "engagement" summed over the
+    cluster and "also_on" listing the other sources.
+    """
+    names = dict(sources)
+    flat = []
+    for key, _ in sources:
+        for position, item in enumerate(results.get(key, [])):
+            if isinstance(item, dict) and not item.get("title", "").startswith("[ERROR]"):
+                flat.append((key, position, item))
+
+    # log engagement as a share of the source's top item, like app/ranking.py
+    top = {}
+    for key, _, item in flat:
+        top[key] = max(top.get(key, 0.0), math.log1p(max(engagement(item), 0)))
+    relative = [math.log1p(max(engagement(item), 0)) / (top[key] or 1.0) for key, _, item in flat]
+
+    keep = {}
+    for members in cluster([item for _, _, item in flat]):
+        best = max(members, key=lambda i: relative[i])
+        key, position, item = flat[best]
+        if len(members) > 1:
+            item = {
+                **item,
+                "engagement": sum(engagement(flat[i][2]) for i in members),
+                "also_on": sorted({names[flat[i][0]] for i in members} - {names[key]}),
+            }
+        keep[(key, position)] = item
+
+    deduped = {}
+    for key, _ in sources:
+        deduped[key] = [
+            keep[(key, position)] if (key, position) in keep else item
+            for position, item in enumerate(results.get(key, []))
+            if (key, position) in keep or not isinstance(item, dict) or item.get("title", "").startswith("[ERROR]")
+        ]
+    return deduped
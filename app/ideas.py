@@ -0,0 +1,157 @@
+import json
+import os
+import time
+from pathlib import Path
+
+from app.dedupe import dedupe_sources
+from app.ranking import rank_ideas, rerank_prompt, apply_rerank, load_history, remember_ideas
+from config import IDEA_RERANK_TOP_K
+from llm.async_client import generate_many
+from llm.prompt_packer import engagement
+from llm.openrouter_llama import app_ideas_prompt, parse_app_ideas
+
+# Bump when the layout of the idea snapshot changes; older snapshots are ignored
+IDEA_SNAPSHOT_VERSION = 1
+
+IDEAS_FILE = Path(__file__).parent.parent / "latest_app_ideas.json"
+
+# (cache key, display name) for every source, in dashboard order
+IDEA_SOURCES = [
+    ("reddit_posts", "Reddit"),
+    ("hn_stories", "Hacker News"),
+    ("devto_articles", "Dev.to"),
+    ("lobsters_stories", "Lobsters"),
+    ("github_trending", "GitHub Trending"),
+    ("dribbble_shots", "Dribbble"),
+    ("techcrunch_articles", "TechCrunch"),
+    ("trends", "Google Trends"),
+]
+
+# Sources whose posts go into the combined prompt
+COMBINED_SOURCES = ["reddit_posts", "hn_stories", "trends"]
+
+
+def is_error_result(posts):
+    return bool(posts) and isinstance(posts[0], dict) and posts[0].get("title", "").startswith("[ERROR]")
+
+
+def drop_error_rows(posts):
+    """The posts without the "[ERROR] ..." placeholder rows fetchers return on failure."""
+    return [p for p in posts or [] if not (isinstance(p, dict) and p.get("title", "").startswith("[ERROR]"))]
+
+
+def standardize_post(p, source):
+    if source == "reddit":
+        post = {
+            "title": p.get("title", ""),
+            "selftext": p.get("selftext", ""),
+            "top_comments": p.get("top_comments", [])
+        }
+    elif source == "hn":
+        post = {
+            "title": p.get("title", ""),
+            "selftext": p.get("text", ""),
+            "top_comments": p.get("top_comments", [])
+        }
+    elif source == "trends":
+        post = {
+            "title": p.get("title", ""),
+            "selftext": "",
+            "top_comments": []
+        }
+    else:
+        post = {"title": "", "selftext": "", "top_comments": []}
+    post["engagement"] = engagement(p)
+    return post
+
+
+def _standardize_for_ideas(posts):
+    # Guess source based on input
+    if posts and isinstance(posts[0], dict):
+        if 'subreddit' in posts[0]:
+            source = 'reddit'
+        elif 'score' in posts[0]:
+            source = 'hn'
+        else:
+            source = 'trends'
+    else:
+        source = 'trends'
+    return [standardize_post(p, source) for p in posts]
+
+
+def combined_posts(results):
+    """Reddit, HN and Google Trends posts in the shape app_ideas_prompt expects."""
+    return [standardize_post(p, "reddit") for p in results.get("reddit_posts", [])] \
+        + [standardize_post(s, "hn") for s in results.get("hn_stories", [])] \
+        + [standardize_post(t, "trends") for t in results.get("trends", [])]
+
+
+def build_idea_snapshot(results):
+    """
+    Runs every idea-generation LLM call for one refresh, concurrently, and ranks
+    the ideas locally (see app/ranking.py).
+    Returns: {
+        'version', 'generated_at',
+        'per_source': {cache key: [ideas]},        # shown under each dashboard section
+        'batch_per_source': {display name: [ideas]},
+        'best_ideas': [ideas],                     # the "Top 5" block
+        'combined': [ideas]                        # ideas from Reddit + HN + Trends together
+    }
+    """
+    # Error rows never reach a prompt; sources left with nothing get no prompt of their own
+    results = {key: drop_error_rows(results.get(key, [])) for key, _ in IDEA_SOURCES}
+    keys = [key for key, _ in IDEA_SOURCES if results[key]]
+    requests = [
+        {"prompt": app_ideas_prompt(_standardize_for_ideas(results.get(key, [])), max_ideas=5),
+         "max_tokens": 512, "temperature": 0.8}
+        for key in keys
+    ]
+    # The combined prompt sees each story once, with the engagement of all its copies;
+    # only its own sources are deduped, so no story's kept copy lands outside the prompt
+    deduped = dedupe_sources(results, [(key, name) for key, name in IDEA_SOURCES if key in COMBINED_SOURCES])
+    combined_source = [post for key in COMBINED_SOURCES for post in deduped.get(key, [])]
+    requests.append({"prompt": app_ideas_prompt(combined_posts(deduped), max_ideas=3),
+                     "max_tokens": 512, "temperature": 0.8})
+
+    replies = generate_many(requests)
+    per_source = {key: [] for key, _ in IDEA_SOURCES}
+    for key, content in zip(keys, replies):
+        per_source[key] = [idea for idea in parse_app_ideas(content) if idea.strip()]
+    combined = parse_app_ideas(replies[-1])
+
+    candidates = [
+        {"idea": idea, "source": key, "posts": results.get(key, [])}
+        for key in keys for idea in per_source[key]
+    ] + [{"idea": idea, "source": "combined", "posts": combined_source} for idea in combined]
+    ranked = rank_ideas(candidates, history=load_history())
+    if IDEA_RERANK_TOP_K > 0 and len(ranked) > 1:
+        top = ranked[:IDEA_RERANK_TOP_K]
+        reply = generate_many([{"prompt": rerank_prompt(top), "max_tokens": 64, "temperature": 0}])[0]
+        ranked = apply_rerank(top, reply) + ranked[IDEA_RERANK_TOP_K:]
+    remember_ideas([c["idea"] for c in candidates if not c["idea"].startswith("[ERROR]")])
+
+    return {
+        "version": IDEA_SNAPSHOT_VERSION,
+        "generated_at": time.time(),
+        "per_source": per_source,
+        "batch_per_source": {name: per_source[key] for key, name in IDEA_SOURCES if per_source[key]},
+        "best_ideas": ranked[:5],
+        "combined": combined,
+    }
+
+
+def load_idea_snapshot(cache):
+    """Returns the idea snapshot stored in `cache`, or None if missing or from an older layout."""
+    snapshot = (cache or {}).get("idea_snapshot")
+    if not isinstance(snapshot, dict) or snapshot.get("version") != IDEA_SNAPSHOT_VERSION:
+        return None
+    return snapshot
+
+
+def save_ideas_file(snapshot):
+    ideas_to_save = {**snapshot["batch_per_source"], "best_ideas": snapshot["best_ideas"]}
+    # Write-then-rename, so readers (and other workers) never see a half-written file
+    tmp_path = IDEAS_FILE.with_name(f"{IDEAS_FILE.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(ideas_to_save, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, IDEAS_FILE)
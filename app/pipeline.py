@@ -0,0 +1,128 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from data_sources.registry import SOURCES
+from app.cache_utils import save_results, load_results
+from app.ideas import build_idea_snapshot, save_ideas_file, is_error_result
+from app.source_health import source_health
+from metrics import REFRESH_SECONDS, SOURCE_FETCH_SECONDS, SOURCE_ERRORS, log_event
+from config import REFRESH_MAX_WORKERS, SOURCE_TIMEOUT
+
+# Per-source deadline overrides (seconds); everything else uses SOURCE_TIMEOUT
+SOURCE_TIMEOUTS = {
+    "reddit_posts": 45,
+}
+
+
+def _timed_fetch(fetch, kwargs):
+    started = time.monotonic()
+    result = fetch(**kwargs)
+    return result, time.monotonic() - started
+
+
+def _record_late(health, key, future):
+    if not future.cancelled() and future.exception() is None:
+        health.record_latency(key, future.result()[1])
+
+
+def fetch_all_sources(previous=None, max_workers=REFRESH_MAX_WORKERS, timeouts=None, health=source_health):
+    """
+    Runs every fetcher in SOURCES concurrently on a bounded thread pool.
+    Each source gets its own deadline, counted from the start of the run and adapted
+    to its recent latency (see app/source_health.py).
+    Sources that miss it, raise or return an "[ERROR]" row keep their data from
+    `previous` and are marked stale; sources whose circuit breaker is open are not
+    fetched at all ("skipped").
+    Returns: (results, source_status) where source_status is {key: {"state", "elapsed"}}
+    """
+    previous = previous or {}
+    timeouts = {**SOURCE_TIMEOUTS, **(timeouts or {})}
+    results = {}
+    status = {}
+
+    started = time.monotonic()
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="refresh")
+    futures = {}
+    deadlines = {}
+
+    def mark_stale(key, state, error=None, items=None):
+        kept = previous.get(key, [])
+        # Error rows only replace previous data when there is no good data to keep
+        results[key] = items if items is not None and (not kept or is_error_result(kept)) else kept
+        status[key] = {"state": state, "elapsed": round(time.monotonic() - started, 3)}
+        if error:
+            status[key]["error"] = error
+        SOURCE_ERRORS.inc(source=key, kind=state)
+        log_event("source_fetch", source=key, **status[key])
+
+    for key, fetch, kwargs in SOURCES:
+        if not health.allow(key):
+            mark_stale(key, "skipped", f"circuit open until {time.ctime(health.open_until(key))}")
+            continue
+        future = executor.submit(_timed_fetch, fetch, kwargs)
+        futures[future] = key
+        deadlines[future] = started + health.deadline(key, timeouts.get(key, SOURCE_TIMEOUT))
+
+    pending = set(futures)
+    try:
+        while pending:
+            now = time.monotonic()
+            expired = {f for f in pending if deadlines[f] <= now}
+            for future in expired:
+                key = futures[future]
+                if not future.cancel():
+                    # Still running: let it report its real fetch time when it's done
+                    future.add_done_callback(lambda f, key=key: _record_late(health, key, f))
+                print(f"[WARN] {key} missed its deadline, keeping previous data")
+                health.record_failure(key, elapsed=now - started)
+                mark_stale(key, "stale")
+            pending -= expired
+            if not pending:
+                break
+            next_deadline = min(deadlines[f] for f in pending)
+            done, pending = wait(pending, timeout=max(next_deadline - now, 0), return_when=FIRST_COMPLETED)
+            for future in done:
+                key = futures[future]
+                try:
+                    items, elapsed = future.result()
+                except Exception as e:
+                    print(f"[ERROR] {key} fetch failed: {e}")
+                    health.record_failure(key)
+                    mark_stale(key, "error", str(e))
+                    continue
+                if is_error_result(items):
+                    health.record_failure(key)
+                    mark_stale(key, "error", items[0]["title"], items=items)
+                    continue
+                health.record_success(key, elapsed)
+                results[key] = items
+                status[key] = {"state": "fresh", "elapsed": round(elapsed, 3)}
+                SOURCE_FETCH_SECONDS.observe(elapsed, source=key)
+                log_event("source_fetch", source=key, items=len(items), **status[key])
+    finally:
+        # Don't wait for fetchers that ran past their deadline
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results, status
+
+
+def run_refresh():
+    """Fetches all sources, generates every idea list and saves the snapshot."""
+    started = time.monotonic()
+    results, status = fetch_all_sources(previous=load_results())
+
+    idea_snapshot = build_idea_snapshot(results)
+    snapshot = {
+        **results,
+        "ideas": idea_snapshot["combined"],
+        "idea_snapshot": idea_snapshot,
+        "refreshed_at": time.time(),
+        "source_status": status,
+    }
+    version = save_results(snapshot)
+    save_ideas_file(idea_snapshot)
+    elapsed = time.monotonic() - started
+    stale = [k for k, s in status.items() if s['state'] != 'fresh']
+    REFRESH_SECONDS.observe(elapsed)
+    log_event("refresh", version=version, elapsed=round(elapsed, 3), stale=stale)
+    print(f"[INFO] Refresh finished in {elapsed:.1f}s (stale: {stale})")
+    return snapshot
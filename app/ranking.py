@@ -0,0 +1,162 @@
+"""
+Local ranking of generated app ideas, instead of asking the model to pick the best.
+
+Each idea gets a relevance score from
+- engagement: how engaging the post it was drawn from is (the best TF-IDF match among
+  the posts of its source, log-scaled and normalized per source, since a Reddit score
+  and a GitHub star count are not on the same scale)
+- novelty: 1 - its highest TF-IDF cosine similarity to the ideas of past refreshes
+and the top ideas are then picked by maximal marginal relevance, so near-identical
+ideas and ideas from an already picked source are pushed down.
+
+Everything is deterministic (ties go to the earlier candidate). An LLM rerank of
+only the top IDEA_RERANK_TOP_K ideas can be switched on in config.py.
+"""
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+
+from app.dedupe import tokenize
+from config import IDEA_HISTORY_PATH, IDEA_HISTORY_SIZE
+from llm.prompt_packer import engagement
+
+ENGAGEMENT_WEIGHT = 0.5
+NOVELTY_WEIGHT = 0.5
+MMR_LAMBDA = 0.7  # relevance vs. similarity to the ideas already picked
+SOURCE_PENALTY = 0.15  # per idea already picked from the same source
+
+_history_lock = threading.Lock()
+
+
+def _post_text(post):
+    return " ".join(str(post.get(field) or "") for field in ("title", "selftext", "text", "description"))
+
+
+def _vectorize(documents):
+    """L2-normalized TF-IDF vectors ({term: weight}) for a list of token lists."""
+    df = Counter(term for tokens in documents for term in set(tokens))
+    n = len(documents)
+    vectors = []
+    for tokens in documents:
+        tf = Counter(tokens)
+        vector = {term: count * (math.log((1 + n) / (1 + df[term])) + 1) for term, count in tf.items()}
+        norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+        vectors.append({term: w / norm for term, w in vector.items()})
+    return vectors
+
+
+def _cosine(a, b):
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(w * b.get(term, 0.0) for term, w in a.items())
+
+
+def _engagement_scores(candidates, idea_vectors, post_vectors):
+    scores = []
+    for candidate, vector in zip(candidates, idea_vectors):
+        posts = candidate["posts"]
+        if not posts:
+            scores.append(0.0)
+            continue
+        levels = [math.log1p(max(engagement(p), 0)) for p in posts]
+        top = max(levels) or 1.0
+        similarities = [_cosine(vector, post_vectors[id(p)]) for p in posts]
+        best = max(range(len(posts)), key=lambda i: similarities[i])
+        if similarities[best] > 0:
+            scores.append(levels[best] / top)
+        else:
+            scores.append(sum(levels) / len(levels) / top)
+    return scores
+
+
+def rank_ideas(candidates, history=(), top_n=None):
+    """
+    candidates: list of {"idea": text, "source": name, "posts": [posts the idea was generated from]}
+    history: past idea texts, for the novelty score
+    Returns: idea texts, best first (all of them unless top_n is given)
+    """
+    candidates = [c for c in candidates if c["idea"].strip() and not c["idea"].startswith("[ERROR]")]
+    if not candidates:
+        return []
+    history = list(history)
+    posts = {id(p): p for c in candidates for p in c["posts"]}
+    documents = [tokenize(c["idea"]) for c in candidates] + [tokenize(h) for h in history] \
+        + [tokenize(_post_text(p)) for p in posts.values()]
+    vectors = _vectorize(documents)
+    idea_vectors = vectors[:len(candidates)]
+    history_vectors = vectors[len(candidates):len(candidates) + len(history)]
+    post_vectors = dict(zip(posts, vectors[len(candidates) + len(history):]))
+
+    engagement_scores = _engagement_scores(candidates, idea_vectors, post_vectors)
+    relevance = [
+        ENGAGEMENT_WEIGHT * engagement_scores[i]
+        + NOVELTY_WEIGHT * (1 - max((_cosine(v, h) for h in history_vectors), default=0.0))
+        for i, v in enumerate(idea_vectors)
+    ]
+
+    picked = []
+    per_source = Counter()
+    seen = set()
+    remaining = list(range(len(candidates)))
+    while remaining and (top_n is None or len(picked) < top_n):
+        def mmr(i):
+            redundancy = max((_cosine(idea_vectors[i], idea_vectors[j]) for j in picked), default=0.0)
+            return MMR_LAMBDA * relevance[i] - (1 - MMR_LAMBDA) * redundancy \
+                - SOURCE_PENALTY * per_source[candidates[i]["source"]]
+        best = max(remaining, key=lambda i: (mmr(i), -i))
+        remaining.remove(best)
+        key = candidates[best]["idea"].strip().lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        picked.append(best)
+        per_source[candidates[best]["source"]] += 1
+    return [candidates[i]["idea"] for i in picked]
+
+
+def rerank_prompt(ideas):
+    return (
+        "Order the following app ideas from most to least promising and innovative. "
+        "Reply with the idea numbers only, comma-separated.\n"
+        + "".join(f"{i + 1}. {idea}\n" for i, idea in enumerate(ideas))
+    )
+
+
+def apply_rerank(ideas, content):
+    """Reorders `ideas` by the numbers in the reply to rerank_prompt; unlisted ideas keep their order."""
+    order = []
+    for number in re.findall(r"\d+", content or ""):
+        index = int(number) - 1
+        if 0 <= index < len(ideas) and index not in order:
+            order.append(index)
+    return [ideas[i] for i in order] + [idea for i, idea in enumerate(ideas) if i not in order]
+
+
+def _load_entries():
+    try:
+        with open(IDEA_HISTORY_PATH, "r", encoding="utf-8") as f:
+            return [entry for entry in json.load(f) if isinstance(entry, dict) and "idea" in entry]
+    except (OSError, ValueError, TypeError):
+        return []
+
+
+def load_history():
+    return [entry["idea"] for entry in _load_entries()]
+
+
+def remember_ideas(ideas):
+    """Appends this refresh's ideas to the history used for novelty (keeps the last IDEA_HISTORY_SIZE)."""
+    with _history_lock:
+        now = time.time()
+        entries = _load_entries() + [{"idea": idea, "at": now} for idea in ideas]
+        tmp_path = f"{IDEA_HISTORY_PATH}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entries[-IDEA_HISTORY_SIZE:], f, ensure_ascii=False)
+            os.replace(tmp_path, IDEA_HISTORY_PATH)
+        except OSError as e:
+            print(f"[ERROR] Could not save idea history: {e}")
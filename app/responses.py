@@ -0,0 +1,98 @@
+"""
+Helpers for responses that are built once per snapshot version and then served as bytes.
+
+- dumps(): orjson when installed, the json module otherwise
+- encode_variants(): the body plus its gzip (and brotli, if installed) copies
+- VersionedCache: pre-serialized responses, dropped when the snapshot version changes
+- send(): picks the variant the client accepts, with ETag / 304 handling
+"""
+import gzip
+import json
+import threading
+from collections import OrderedDict
+
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # in requirements.txt; the json fallback only covers minimal installs
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # brotli is optional
+    brotli = None
+
+MIN_COMPRESS_SIZE = 512  # smaller bodies aren't worth a Content-Encoding
+
+
+def dumps(obj):
+    """JSON bytes for `obj`."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def encode_variants(body):
+    """{content-encoding or None: bytes} for `body`."""
+    variants = {None: body}
+    if len(body) >= MIN_COMPRESS_SIZE:
+        variants["gzip"] = gzip.compress(body, compresslevel=6)
+        if brotli is not None:
+            variants["br"] = brotli.compress(body, quality=5)
+    return variants
+
+
+def etag_matches(request, etag):
+    header = request.headers.get("if-none-match", "")
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def _accepted(request):
+    accepted = set()
+    for part in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def send(request, variants, etag, media_type, headers=None):
+    """Response with the best variant the client accepts (br, then gzip, then identity)."""
+    accepted = _accepted(request)
+    encoding = next((e for e in ("br", "gzip") if e in variants and (e in accepted or "*" in accepted)), None)
+    headers = {"Cache-Control": "no-cache", "Vary": "Accept-Encoding", **(headers or {})}
+    headers["ETag"] = f'"{etag}-{encoding}"' if encoding else f'"{etag}"'
+    if etag_matches(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=variants[encoding], media_type=media_type, headers=headers)
+
+
+class VersionedCache:
+    """Bounded LRU of built responses for one snapshot version at a time."""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, version, key, build):
+        """Returns the cached value for (version, key), calling build() once on a miss."""
+        with self._lock:
+            if version != self.version:
+                self._entries.clear()
+                self.version = version
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        value = build()
+        with self._lock:
+            if version == self.version:
+                self._entries[key] = value
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
@@ -0,0 +1,149 @@
+"""
+Background refresh scheduler.
+
+Only one refresh runs at a time: refresh() starts the pipeline if it is idle,
+otherwise it joins the refresh already in progress and returns its snapshot.
+The scheduler thread calls it every REFRESH_INTERVAL +/- REFRESH_JITTER seconds,
+so several app instances started together don't all refresh at the same moment,
+and the dashboard uses refresh_in_background() to revalidate a stale snapshot.
+After a failed refresh, background revalidation backs off (REFRESH_FAILURE_BACKOFF,
+doubling per failure up to REFRESH_INTERVAL) so visitors during an outage don't
+keep refreshes running back to back; /refresh and the scheduler still run.
+
+Across worker processes, a refresh holds an flock on REFRESH_LOCK_PATH. A worker
+that had to wait for the lock doesn't repeat the work if a refresh finished while
+it waited: it returns that snapshot, which every worker picks up from the store.
+"""
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+import schedule
+
+try:
+    import fcntl
+except ImportError:  # not on Windows: refreshes are then only single-flight per process
+    fcntl = None
+
+from app.cache_utils import load_snapshot
+from app.pipeline import run_refresh
+from config import REFRESH_INTERVAL, REFRESH_JITTER, REFRESH_LOCK_PATH, REFRESH_FAILURE_BACKOFF
+
+_state_lock = threading.Lock()
+_running = None  # Future of the refresh in progress
+_failures = 0  # refreshes failed in a row
+_retry_at = 0.0  # no background refresh before this time (after a failure)
+
+_scheduler = schedule.Scheduler()
+_stop = threading.Event()
+_thread = None
+
+
+def refresh():
+    """Runs a refresh, or waits for the one already running. Returns the new snapshot."""
+    global _running, _failures, _retry_at
+    with _state_lock:
+        future = _running
+        owner = future is None
+        if owner:
+            future = _running = Future()
+    if not owner:
+        return future.result()
+    try:
+        future.set_result(_refresh_once())
+    except BaseException as e:
+        future.set_exception(e)
+    finally:
+        with _state_lock:
+            _running = None
+            if future.exception() is None:
+                _failures, _retry_at = 0, 0.0
+            else:
+                _failures += 1
+                _retry_at = time.time() + min(REFRESH_FAILURE_BACKOFF * 2 ** (_failures - 1), REFRESH_INTERVAL)
+    return future.result()
+
+
+@contextmanager
+def _process_lock():
+    """Holds the inter-process refresh lock; yields True if another process had it first."""
+    if fcntl is None:
+        yield False
+        return
+    with open(REFRESH_LOCK_PATH, "a") as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            waited = False
+        except BlockingIOError:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            waited = True
+        try:
+            yield waited
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _refresh_once():
+    requested_at = time.time()
+    with _process_lock() as waited:
+        if waited:
+            _, snapshot = load_snapshot()
+            if snapshot and snapshot.get("refreshed_at", 0) >= requested_at:
+                print("[INFO] Another worker refreshed while we waited; using its snapshot")
+                return snapshot
+        return run_refresh()
+
+
+def is_refreshing():
+    return _running is not None
+
+
+def _scheduled_refresh():
+    try:
+        refresh()
+    except Exception as e:
+        print(f"[ERROR] Scheduled refresh failed: {e}")
+
+
+def _scheduled_refresh_if_due(min_age):
+    # Every worker runs a scheduler; skip if another one (or /refresh) refreshed recently
+    _, snapshot = load_snapshot()
+    if snapshot and time.time() - snapshot.get("refreshed_at", 0) < min_age:
+        return
+    _scheduled_refresh()
+
+
+def refresh_in_background():
+    """
+    Starts a refresh without waiting for it. Returns False if one is already running,
+    or if the last one failed and its backoff hasn't passed yet.
+    """
+    if is_refreshing() or time.time() < _retry_at:
+        return False
+    threading.Thread(target=_scheduled_refresh, name="background-refresh", daemon=True).start()
+    return True
+
+
+def _run():
+    while not _stop.wait(1):
+        _scheduler.run_pending()
+
+
+def start_scheduler(interval=REFRESH_INTERVAL, jitter=REFRESH_JITTER):
+    """Starts the scheduler thread (once per process)."""
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+    jitter = min(jitter, interval - 1)
+    _scheduler.clear()
+    _scheduler.every(interval - jitter).to(interval + jitter).seconds.do(_scheduled_refresh_if_due, interval - jitter)
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name="refresh-scheduler", daemon=True)
+    _thread.start()
+    print(f"[INFO] Refresh scheduler started (every {interval}s +/- {jitter}s)")
+
+
+def stop_scheduler():
+    _stop.set()
+    _scheduler.clear()
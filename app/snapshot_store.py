@@ -0,0 +1,225 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    version INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    changed TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sources (
+    name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    item_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    source TEXT NOT NULL,
+    item_key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    PRIMARY KEY (source, item_key)
+);
+CREATE INDEX IF NOT EXISTS items_version ON items (version);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    version INTEGER NOT NULL
+);
+"""
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, sort_keys=True)
+
+
+def _is_item_list(value):
+    return isinstance(value, list) and all(isinstance(v, dict) for v in value)
+
+
+def _item_keys(items):
+    """Stable per-item keys (id, else url, else title), made unique within the source."""
+    keys = []
+    seen = {}
+    for position, item in enumerate(items):
+        base = str(item.get("id") or item.get("url") or item.get("title") or position)
+        n = seen.get(base, 0)
+        seen[base] = n + 1
+        keys.append(base if n == 0 else f"{base}#{n}")
+    return keys
+
+
+class SnapshotStore:
+    """
+    Snapshot storage in SQLite (WAL mode).
+    Every list of item dicts in a snapshot is a source, stored one row per item;
+    any other value (idea lists, timestamps, status) goes into the meta table.
+    Each publish is one transaction that only writes the rows that changed
+    and records a new snapshot version.
+    """
+
+    def __init__(self, path, legacy_json=None):
+        self.path = str(path)
+        self.legacy_json = Path(legacy_json) if legacy_json else None
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    conn.executescript(SCHEMA)
+                    self._import_legacy_json(conn)
+                    self._initialized = True
+        return conn
+
+    def _import_legacy_json(self, conn):
+        if not self.legacy_json or not self.legacy_json.exists():
+            return
+        if conn.execute("SELECT 1 FROM snapshots LIMIT 1").fetchone():
+            return
+        try:
+            with open(self.legacy_json, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] Could not import {self.legacy_json}: {e}")
+            return
+        if data:
+            self._publish(conn, data)
+            print(f"[INFO] Imported {self.legacy_json.name} into the snapshot store")
+
+    def file_signature(self):
+        """(mtime_ns, size) of the database and its WAL file; changes whenever a commit lands."""
+        signature = []
+        for path in (self.path, self.path + "-wal"):
+            try:
+                st = os.stat(path)
+                signature.append((st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def current_version(self):
+        row = self._connect().execute("SELECT MAX(version) FROM snapshots").fetchone()
+        return row[0] or 0
+
+    def publish(self, data):
+        """
+        Atomically writes a snapshot (or part of one: keys not in `data` are left as they are).
+        Returns the new snapshot version.
+        """
+        return self._publish(self._connect(), data)
+
+    def save_source(self, name, items):
+        """Upserts a single source; returns the new snapshot version."""
+        return self.publish({name: items})
+
+    def _publish(self, conn, data):
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            version = conn.execute(
+                "INSERT INTO snapshots (created_at, changed) VALUES (?, '[]')", (now,)
+            ).lastrowid
+            changed = []
+            for key, value in data.items():
+                if _is_item_list(value) and self._write_source(conn, key, value, version, now):
+                    changed.append(key)
+                elif not _is_item_list(value) and self._write_meta(conn, key, value, version):
+                    changed.append(key)
+            conn.execute("UPDATE snapshots SET changed = ? WHERE version = ?", (_dumps(changed), version))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return version
+
+    def _write_source(self, conn, name, items, version, now):
+        # A key that used to hold a meta value now holds items
+        conn.execute("DELETE FROM meta WHERE key = ?", (name,))
+        existing = {
+            key: (position, data)
+            for key, position, data in conn.execute(
+                "SELECT item_key, position, data FROM items WHERE source = ?", (name,)
+            )
+        }
+        rows = []
+        keys = _item_keys(items)
+        for position, (key, item) in enumerate(zip(keys, items)):
+            data = _dumps(item)
+            if existing.get(key) != (position, data):
+                rows.append((name, key, position, data, version))
+        removed = [(name, key) for key in existing.keys() - set(keys)]
+        conn.executemany(
+            "INSERT INTO items (source, item_key, position, data, version) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (source, item_key) DO UPDATE SET "
+            "position = excluded.position, data = excluded.data, version = excluded.version",
+            rows,
+        )
+        conn.executemany("DELETE FROM items WHERE source = ? AND item_key = ?", removed)
+        known = conn.execute("SELECT 1 FROM sources WHERE name = ?", (name,)).fetchone()
+        if not rows and not removed and known:
+            return False
+        conn.execute(
+            "INSERT INTO sources (name, version, updated_at, item_count) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET version = excluded.version, "
+            "updated_at = excluded.updated_at, item_count = excluded.item_count",
+            (name, version, now, len(items)),
+        )
+        return True
+
+    def _write_meta(self, conn, key, value, version):
+        conn.execute("DELETE FROM sources WHERE name = ?", (key,))
+        conn.execute("DELETE FROM items WHERE source = ?", (key,))
+        data = _dumps(value)
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        if row and row[0] == data:
+            return False
+        conn.execute(
+            "INSERT INTO meta (key, value, version) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value, version = excluded.version",
+            (key, data, version),
+        )
+        return True
+
+    def load(self):
+        """Returns the latest snapshot as a dict, or None if nothing was published yet."""
+        conn = self._connect()
+        # One read transaction so a concurrent publish is never seen half-applied
+        conn.execute("BEGIN")
+        try:
+            if not conn.execute("SELECT 1 FROM snapshots LIMIT 1").fetchone():
+                return None
+            snapshot = {name: [] for (name,) in conn.execute("SELECT name FROM sources")}
+            for source, data in conn.execute("SELECT source, data FROM items ORDER BY source, position"):
+                snapshot.setdefault(source, []).append(json.loads(data))
+            for key, value in conn.execute("SELECT key, value FROM meta"):
+                snapshot[key] = json.loads(value)
+            return snapshot
+        finally:
+            conn.execute("COMMIT")
+
+    def load_source(self, name):
+        rows = self._connect().execute(
+            "SELECT data FROM items WHERE source = ? ORDER BY position", (name,)
+        )
+        return [json.loads(data) for (data,) in rows]
+
+    def changed_since(self, version):
+        """Returns {source: [items]} for the sources that changed after `version`."""
+        names = [name for (name,) in self._connect().execute(
+            "SELECT name FROM sources WHERE version > ?", (version,)
+        )]
+        return {name: self.load_source(name) for name in names}
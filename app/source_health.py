@@ -0,0 +1,126 @@
+"""
+Per-source health for the refresh pipeline: circuit breakers and adaptive deadlines.
+
+A source that fails BREAKER_FAILURES refreshes in a row (an exception, a missed
+deadline or an "[ERROR]" row) is skipped until its cool-down ends. Then one
+trial fetch is let through: success closes the breaker, another failure opens
+it again for twice as long.
+
+Deadlines follow each source's recent latency: p95 of its last fetches times
+SOURCE_TIMEOUT_P95_FACTOR, kept between SOURCE_TIMEOUT_MIN and the static
+deadline, so a source that normally answers in 1s stops holding a refresh for 25s.
+A missed deadline counts as a sample too (and a late fetch reports its real time
+when it finishes), so the deadline widens for a source that got slower, and the
+half-open trial always gets the static deadline.
+
+This state lives in memory, per process: with several workers each one keeps its
+own breakers and latency windows, built from the refreshes it ran itself.
+"""
+import math
+import threading
+import time
+from collections import deque
+
+from config import (
+    SOURCE_TIMEOUT_P95_FACTOR, SOURCE_TIMEOUT_MIN,
+    BREAKER_FAILURES, BREAKER_COOLDOWN, BREAKER_MAX_COOLDOWN,
+)
+
+LATENCY_WINDOW = 20  # fetch times kept per source
+MIN_SAMPLES = 5  # below this the static deadline is used
+
+
+class CircuitBreaker:
+    def __init__(self, failures=BREAKER_FAILURES, cooldown=BREAKER_COOLDOWN, max_cooldown=BREAKER_MAX_COOLDOWN):
+        self.max_failures = failures
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.failures = 0
+        self.cooldown = cooldown
+        self.open_until = 0.0
+
+    @property
+    def state(self):
+        if self.failures < self.max_failures:
+            return "closed"
+        return "open" if time.time() < self.open_until else "half-open"
+
+    def allow(self):
+        return self.state != "open"
+
+    def success(self):
+        self.failures = 0
+        self.cooldown = self.base_cooldown
+        self.open_until = 0.0
+
+    def failure(self):
+        if self.state == "half-open":
+            # The trial fetch failed too: back off longer
+            self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+        self.failures += 1
+        if self.failures >= self.max_failures:
+            self.open_until = time.time() + self.cooldown
+
+
+class SourceHealth:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._breakers = {}
+        self._latencies = {}
+
+    def _breaker(self, key):
+        if key not in self._breakers:
+            self._breakers[key] = CircuitBreaker()
+        return self._breakers[key]
+
+    def allow(self, key):
+        with self._lock:
+            return self._breaker(key).allow()
+
+    def open_until(self, key):
+        with self._lock:
+            return self._breaker(key).open_until
+
+    def deadline(self, key, default):
+        """Seconds `key` gets this refresh: p95 x factor of recent fetches, capped at `default`."""
+        with self._lock:
+            if self._breaker(key).state == "half-open":
+                return default
+            samples = sorted(self._latencies.get(key, ()))
+        if len(samples) < MIN_SAMPLES:
+            return default
+        p95 = samples[min(len(samples) - 1, math.ceil(0.95 * len(samples)) - 1)]
+        return min(default, max(SOURCE_TIMEOUT_MIN, p95 * SOURCE_TIMEOUT_P95_FACTOR))
+
+    def _add_sample(self, key, elapsed):
+        self._latencies.setdefault(key, deque(maxlen=LATENCY_WINDOW)).append(elapsed)
+
+    def record_latency(self, key, elapsed):
+        """A fetch time without an outcome (a fetch that finished after its deadline)."""
+        with self._lock:
+            self._add_sample(key, elapsed)
+
+    def record_success(self, key, elapsed):
+        with self._lock:
+            self._breaker(key).success()
+            self._add_sample(key, elapsed)
+
+    def record_failure(self, key, elapsed=None):
+        """`elapsed`: time spent before giving up on a missed deadline, kept as a latency sample."""
+        with self._lock:
+            breaker = self._breaker(key)
+            breaker.failure()
+            if elapsed is not None:
+                self._add_sample(key, elapsed)
+            if breaker.state == "open":
+                print(f"[WARN] {key} failed {breaker.failures} times in a row, "
+                      f"skipping it for {breaker.cooldown:.0f}s")
+
+    def snapshot(self):
+        """{key: {"state", "failures", "open_until"}} for status pages."""
+        with self._lock:
+            return {key: {"state": b.state, "failures": b.failures, "open_until": b.open_until}
+                    for key, b in self._breakers.items()}
+
+
+source_health = SourceHealth()
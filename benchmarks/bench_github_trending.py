@@ -0,0 +1,82 @@
+"""
+Parse-time benchmark for the GitHub Trending extractor, run against saved pages.
+
+    python -m benchmarks.bench_github_trending [--repeat 50] [fixture.html ...]
+
+Prints the time per page of data_sources.github_trending_fetcher.parse_trending
+(for limit=5 and for every row), next to the previous BeautifulSoup
+implementation when bs4 is installed.
+"""
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+from data_sources.github_trending_fetcher import parse_trending, CHUNK_SIZE
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+def parse_with_bs4(html, limit):
+    """The BeautifulSoup extraction the fetcher used before the fast path."""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, "html.parser")
+    repos = []
+    for repo in soup.select("article.Box-row")[:limit]:
+        title = repo.h2.a.get_text(strip=True).replace("\n", "").replace(" ", "")
+        href = repo.h2.a["href"]
+        desc = repo.p.get_text(strip=True) if repo.p else ""
+        lang = repo.find("span", itemprop="programmingLanguage")
+        lang = lang.get_text(strip=True) if lang else ""
+        stars = repo.select_one("a.Link--muted[href$='/stargazers']")
+        stars = stars.get_text(strip=True) if stars else "0"
+        repos.append({
+            "title": title,
+            "url": f"https://github.com{href}",
+            "description": desc,
+            "language": lang,
+            "stars": stars
+        })
+    return repos
+
+
+def time_per_page(parse, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        parse()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("fixtures", nargs="*", type=Path)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    try:
+        import bs4  # noqa: F401
+        has_bs4 = True
+    except ImportError:
+        has_bs4 = False
+
+    for path in args.fixtures or sorted(FIXTURES_DIR.glob("github_trending*.html")):
+        raw = path.read_bytes()
+        html = raw.decode("utf-8")
+        chunks = [raw[i:i + CHUNK_SIZE] for i in range(0, len(raw), CHUNK_SIZE)]
+        rows = len(parse_trending(html))
+        print(f"{path.name}: {len(raw) / 1024:.0f} KiB, {rows} rows (median of {args.repeat} runs)")
+        for limit in (5, None):
+            label = f"limit={limit or 'all'}"
+            fast = time_per_page(lambda: parse_trending(chunks, limit=limit), args.repeat)
+            line = f"  {label:<10} fast path {fast:8.2f} ms/page"
+            if has_bs4:
+                assert parse_trending(html, limit) == parse_with_bs4(html, limit), "parsers disagree"
+                slow = time_per_page(lambda: parse_with_bs4(html, limit), args.repeat)
+                line += f"   bs4 {slow:8.2f} ms/page   ({slow / fast:.1f}x)"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Dashboard latency and throughput under concurrent load, fully offline.
+
+    python -m benchmarks.bench_home [--concurrency 1 8 32] [--requests 500] [--mode full etag stream]
+    python -m benchmarks.bench_home --url http://127.0.0.1:8000/   # an already running server
+
+Without --url, one offline refresh builds a snapshot and the app is served by
+uvicorn on a free local port in this process (so the load generator shares the
+GIL with the server; use --url against a separate process for absolute numbers).
+Modes: full (plain GET /), etag (conditional GET answered with 304) and
+stream (GET /?stream=1). Reports p50/p95/p99 latency, requests per second and
+the peak RSS of the process.
+"""
+import argparse
+import resource
+import socket
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+import requests
+
+from benchmarks import offline
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server():
+    import uvicorn
+    from app.web import app
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, name="uvicorn", daemon=True).start()
+    deadline = time.monotonic() + 10
+    while not server.started and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return server, f"http://127.0.0.1:{port}/"
+
+
+def run_load(url, mode, concurrency, total):
+    params = {"stream": 1} if mode == "stream" else {}
+    probe = requests.get(url, params=params)
+    probe.raise_for_status()
+    headers = {"If-None-Match": probe.headers["ETag"]} if mode == "etag" and probe.headers.get("ETag") else {}
+    expected = 304 if headers else 200
+    local = threading.local()
+
+    def one(_):
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        started = time.perf_counter()
+        resp = session.get(url, params=params, headers=headers)
+        resp.content
+        elapsed = time.perf_counter() - started
+        return elapsed, resp.status_code == expected, len(resp.content)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(total)))
+    wall = time.perf_counter() - started
+    latencies = sorted(r[0] for r in results)
+    return {
+        "p50": statistics.median(latencies) * 1000,
+        "p95": latencies[int(0.95 * (len(latencies) - 1))] * 1000,
+        "p99": latencies[int(0.99 * (len(latencies) - 1))] * 1000,
+        "rps": total / wall,
+        "errors": sum(1 for r in results if not r[1]),
+        "bytes": results[-1][2],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="benchmark this server instead of an in-process one")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=500, help="requests per (mode, concurrency)")
+    parser.add_argument("--mode", nargs="+", choices=["full", "etag", "stream"], default=["full", "etag", "stream"])
+    args = parser.parse_args()
+
+    stack = ExitStack()
+    if args.url:
+        url = args.url
+    else:
+        offline.install()
+        stack.enter_context(offline.environment(http_latency=0, llm_latency=0))
+        from app.pipeline import run_refresh
+        run_refresh()
+        server, url = start_server()
+        stack.callback(setattr, server, "should_exit", True)
+
+    print(f"{'mode':<7}{'conc':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}{'bytes':>9}{'errors':>8}")
+    for mode in args.mode:
+        for concurrency in args.concurrency:
+            run_load(url, mode, concurrency, min(args.requests, 50))  # warm-up
+            r = run_load(url, mode, concurrency, args.requests)
+            print(f"{mode:<7}{concurrency:>5}{r['p50']:>10.2f}{r['p95']:>10.2f}{r['p99']:>10.2f}"
+                  f"{r['rps']:>10.0f}{r['bytes']:>9}{r['errors']:>8}")
+    print(f"\npeak RSS of this process: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB")
+    stack.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Import-time benchmark for the entry points, each imported in a fresh interpreter.
+
+    python -m benchmarks.bench_import [--repeat 5] [--top 10] [module ...]
+
+For every module (default: app.web, app.pipeline, main) prints the median wall
+time of `python -c "import <module>"` and the cumulative `python -X importtime`
+cost of its slowest imports, and lists the heavy optional dependencies (praw,
+pytrends, pandas, bs4, openai) that the import pulled in.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+DEFAULT_MODULES = ["app.web", "app.pipeline", "main"]
+HEAVY = ("praw", "pytrends", "pandas", "bs4", "openai")
+
+PROBE = """
+import sys, time
+started = time.perf_counter()
+import {module}
+print(time.perf_counter() - started)
+print(",".join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+
+def _env():
+    # No bytecode writes, so every run compiles the same way
+    return {**os.environ, "PYTHONPATH": str(ROOT), "PYTHONDONTWRITEBYTECODE": "1"}
+
+
+def time_import(module):
+    """(seconds, heavy modules loaded) for one cold import of `module`."""
+    out = subprocess.run([sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY)],
+                         cwd=ROOT, env=_env(), capture_output=True, text=True, check=True).stdout.split("\n")
+    return float(out[-3]), [name for name in out[-2].split(",") if name]
+
+
+def slowest_imports(module, top):
+    """The `top` imports with the largest cumulative time (microseconds) under -X importtime."""
+    err = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                         cwd=ROOT, env=_env(), capture_output=True, text=True, check=True).stderr
+    rows = []
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    for module in args.modules:
+        runs = [time_import(module) for _ in range(args.repeat)]
+        median = statistics.median(seconds for seconds, _ in runs)
+        heavy = runs[-1][1]
+        print(f"{module}: {median * 1000:.0f} ms (median of {args.repeat}), heavy imports: {', '.join(heavy) or 'none'}")
+        for cumulative, name in slowest_imports(module, args.top):
+            print(f"    {cumulative / 1000:8.1f} ms  {name}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
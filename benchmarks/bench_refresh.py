@@ -0,0 +1,64 @@
+"""
+End-to-end refresh benchmark, fully offline.
+
+    python -m benchmarks.bench_refresh [--runs 5] [--http-latency 0.05] [--llm-latency 0.5] [--warm]
+
+Replays the fixture cassette for every source and answers LLM calls from a
+local fake OpenRouter (see benchmarks/offline.py), then times run_refresh().
+Runs are cold (sync state cleared) unless --warm, which keeps ETags and
+cached comments between runs. A last traced run reports peak Python memory.
+"""
+import argparse
+import statistics
+import time
+import tracemalloc
+
+from benchmarks import offline
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--http-latency", type=float, default=0.05, help="seconds per replayed HTTP request")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="seconds per fake LLM call")
+    parser.add_argument("--warm", action="store_true", help="keep sync state (ETags, comments) between runs")
+    parser.add_argument("--rate-limit", action="store_true", help="keep the configured LLM requests-per-minute limit")
+    args = parser.parse_args()
+
+    offline.install(llm_rate_limit=args.rate_limit)
+    with offline.environment(http_latency=args.http_latency, llm_latency=args.llm_latency) as env:
+        from app.pipeline import run_refresh
+
+        samples = []
+        for run in range(args.runs + 1):
+            if not args.warm:
+                offline.reset_sync_state()
+            requests_before, calls_before = env.adapter.requests, env.llm.calls
+            started = time.perf_counter()
+            snapshot = run_refresh()
+            elapsed = time.perf_counter() - started
+            if run == 0:
+                continue  # imports, thread pools and connections warm up on the first run
+            samples.append(elapsed)
+            states = sorted({s["state"] for s in snapshot["source_status"].values()})
+            print(f"run {run}: {elapsed:6.2f}s  {env.adapter.requests - requests_before} HTTP requests, "
+                  f"{env.llm.calls - calls_before} LLM calls, sources {states}")
+
+        if not args.warm:
+            offline.reset_sync_state()
+        tracemalloc.start()
+        run_refresh()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"\nrefresh wall time: median {statistics.median(samples):.2f}s, "
+              f"min {min(samples):.2f}s, max {max(samples):.2f}s over {len(samples)} runs")
+        print(f"peak traced memory during a refresh: {peak / 2**20:.1f} MiB")
+        print(f"fake LLM: {env.llm.calls} calls, {env.llm.prompt_tokens} prompt / "
+              f"{env.llm.completion_tokens} completion tokens (approx.)")
+        if env.adapter.misses:
+            print(f"[WARN] {len(set(env.adapter.misses))} URLs not in the cassette, e.g. {env.adapter.misses[0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""
+Offline harness shared by the end-to-end benchmarks.
+
+    from benchmarks import offline
+    with offline.environment(http_latency=0.05, llm_latency=0.5) as env:
+        ...  # run_refresh(), the web app, ... with no network
+
+install() must run before anything imports config.py: it points every state
+file (snapshot store, sync state, LLM cache, idea history, ideas file) at a
+temporary directory and OPENROUTER_BASE_URL at the fake server below.
+
+Inside environment():
+- every data_sources request on the shared http_client session is answered
+  from the cassette (benchmarks/fixtures/cassette.json), with conditional
+  requests getting a 304 when they carry the recorded ETag
+- praw and pytrends are replaced by fakes replaying the cassette's
+  "reddit" and "google_trends" sections
+- FakeOpenRouter, a local OpenAI-compatible /chat/completions server, answers
+  every LLM call after `llm_latency` seconds
+
+Record a fresh cassette from the live sites with python -m benchmarks.record_fixtures.
+"""
+import hashlib
+import io
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+CASSETTE = FIXTURES_DIR / "cassette.json"
+
+_installed = None
+
+
+def install(llm_rate_limit=False):
+    """Isolates all on-disk state in a temp dir; call before importing config. Returns the dir."""
+    global _installed
+    if _installed:
+        return _installed
+    state_dir = Path(tempfile.mkdtemp(prefix="appgen-bench-"))
+    os.environ.update({
+        "SNAPSHOT_DB_PATH": str(state_dir / "snapshots.sqlite3"),
+        "SNAPSHOT_LEGACY_JSON": "",  # cold runs start from an empty store, not the repo's JSON cache
+        "SYNC_STATE_PATH": str(state_dir / "sync_state.json"),
+        "LLM_CACHE_PATH": str(state_dir / "llm_cache.sqlite3"),
+        "IDEA_HISTORY_PATH": str(state_dir / "idea_history.json"),
+        "SCHEDULER_ENABLED": "0",
+        "METRICS_LOG_JSON": "0",
+    })
+    os.environ.setdefault("OPENROUTER_API_KEY", "benchmark")
+    os.environ.setdefault("LLM_CACHE_TTL", "0")  # measure the LLM calls, not the cache
+    if not llm_rate_limit:
+        os.environ.setdefault("LLM_REQUESTS_PER_MINUTE", "1000000")
+        os.environ.setdefault("LLM_BURST", "1000")
+    _installed = state_dir
+    return state_dir
+
+
+def load_cassette(path=CASSETTE):
+    with open(path, "r", encoding="utf-8") as f:
+        cassette = json.load(f)
+    for entry in cassette.get("http", {}).values():
+        if "body_file" in entry:
+            entry["body"] = (path.parent / entry.pop("body_file")).read_text(encoding="utf-8")
+    return cassette
+
+
+# --- HTTP replay -------------------------------------------------------------
+
+def replay_adapter(cassette, latency=0.0):
+    import requests
+    from requests.adapters import BaseAdapter
+    from requests.structures import CaseInsensitiveDict
+
+    class ReplayAdapter(BaseAdapter):
+        """Answers requests from the cassette; unknown URLs get a 404."""
+
+        def __init__(self):
+            super().__init__()
+            self.requests = 0
+            self.misses = []
+
+        def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+            self.requests += 1
+            if latency:
+                time.sleep(latency)
+            entry = cassette["http"].get(f"{request.method} {request.url}")
+            if entry is None:
+                self.misses.append(request.url)
+                entry = {"status": 404, "headers": {}, "body": ""}
+            headers = CaseInsensitiveDict(entry.get("headers", {}))
+            status = entry["status"]
+            if headers.get("ETag") and request.headers.get("If-None-Match") == headers["ETag"]:
+                status, body = 304, b""
+            else:
+                body = entry["body"].encode("utf-8")
+            resp = requests.Response()
+            resp.status_code = status
+            resp.headers = headers
+            resp.raw = io.BytesIO(body)
+            resp.url = request.url
+            resp.request = request
+            resp.encoding = None
+            resp.reason = "OK" if status < 400 else "Not Found"
+            return resp
+
+        def close(self):
+            pass
+
+    return ReplayAdapter()
+
+
+# --- praw / pytrends fakes ---------------------------------------------------
+
+class _Comment:
+    def __init__(self, body):
+        self.body = body
+
+
+class _Comments(list):
+    def replace_more(self, limit=None):
+        return []
+
+
+class _Submission:
+    def __init__(self, data):
+        self.id = data["id"]
+        self.title = data["title"]
+        self.score = data["score"]
+        self.url = data["url"]
+        self.created_utc = data["created_utc"]
+        self.num_comments = data["num_comments"]
+        self.selftext = data["selftext"]
+        self.comment_sort = None
+        self.comment_limit = None
+        self._comments = data.get("comments", [])
+
+    @property
+    def comments(self):
+        limit = self.comment_limit if self.comment_limit is not None else len(self._comments)
+        return _Comments(_Comment(body) for body in self._comments[:limit])
+
+
+class FakeReddit:
+    def __init__(self, subreddits, latency=0.0):
+        self._subreddits = subreddits
+        self._latency = latency
+
+    def subreddit(self, name):
+        fake = self
+
+        class _Subreddit:
+            def top(self, time_filter="day", limit=10):
+                if fake._latency:
+                    time.sleep(fake._latency)
+                return [_Submission(post) for post in fake._subreddits.get(name, [])[:limit]]
+
+        return _Subreddit()
+
+
+def fake_trending_searches(regions, latency=0.0):
+    import pandas as pd
+
+    def trending_searches(region):
+        if latency:
+            time.sleep(latency)
+        if region not in regions:
+            raise RuntimeError(f"no recorded trends for {region}")
+        return pd.DataFrame(regions[region])
+
+    return trending_searches
+
+
+# --- fake OpenRouter ---------------------------------------------------------
+
+_COUNT_RE = re.compile(r"(?:exactly|up to) (\d+)")
+_TITLE_RE = re.compile(r"^(?:Title: |- )(.+)$", re.MULTILINE)
+
+
+def fake_completion(prompt):
+    """A deterministic reply in the format the prompt asks for."""
+    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    if prompt.startswith("Order the following app ideas"):
+        count = len(re.findall(r"^\d+\. ", prompt, re.MULTILINE))
+        return ", ".join(str(i + 1) for i in range(count))
+    match = _COUNT_RE.search(prompt)
+    count = int(match.group(1)) if match else 3
+    titles = _TITLE_RE.findall(prompt) or ["trending topics"]
+    return "\n".join(
+        f"{i + 1}. App{digest[i * 4:i * 4 + 4]} - A mobile app around \"{titles[i % len(titles)][:60]}\""
+        for i in range(count)
+    )
+
+
+class FakeOpenRouter:
+    """OpenAI-compatible chat completions server on 127.0.0.1 with a fixed per-call latency."""
+
+    def __init__(self, latency=0.5):
+        self.latency = latency
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                prompt = request["messages"][-1]["content"]
+                time.sleep(server.latency)
+                content = fake_completion(prompt)
+                usage = {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4}
+                usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+                with server._lock:
+                    server.calls += 1
+                    server.prompt_tokens += usage["prompt_tokens"]
+                    server.completion_tokens += usage["completion_tokens"]
+                body = json.dumps({
+                    "id": f"bench-{server.calls}", "object": "chat.completion", "created": int(time.time()),
+                    "model": request.get("model"),
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": content}}],
+                    "usage": usage,
+                }).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/api/v1"
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, name="fake-openrouter", daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+# --- everything together -----------------------------------------------------
+
+@contextmanager
+def environment(http_latency=0.05, llm_latency=0.5, cassette_path=CASSETTE, llm_rate_limit=False):
+    """
+    Runs the block fully offline. Yields a namespace with .adapter (replay stats),
+    .llm (FakeOpenRouter) and .state_dir.
+    """
+    state_dir = install(llm_rate_limit=llm_rate_limit)
+    llm = FakeOpenRouter(latency=llm_latency).start()
+    os.environ["OPENROUTER_BASE_URL"] = llm.url
+
+    from data_sources import http_client, reddit_fetcher, google_trends_fetcher
+    from llm import async_client
+    import app.ideas
+
+    cassette = load_cassette(cassette_path)
+    adapter = replay_adapter(cassette, latency=http_latency)
+    real_adapters = dict(http_client.session.adapters)
+    http_client.session.mount("https://", adapter)
+    http_client.session.mount("http://", adapter)
+    reddit = FakeReddit(cassette.get("reddit", {}), latency=http_latency)
+    originals = (reddit_fetcher.get_reddit_client, google_trends_fetcher._trending_searches,
+                 async_client.llm_client._client, app.ideas.IDEAS_FILE)
+    reddit_fetcher.get_reddit_client = lambda: reddit
+    google_trends_fetcher._trending_searches = fake_trending_searches(cassette.get("google_trends", {}), http_latency)
+    # The client may already exist with the real base URL
+    async_client.llm_client._client = None
+    app.ideas.IDEAS_FILE = state_dir / "latest_app_ideas.json"
+
+    try:
+        yield SimpleNamespace(adapter=adapter, llm=llm, state_dir=state_dir)
+    finally:
+        (reddit_fetcher.get_reddit_client, google_trends_fetcher._trending_searches,
+         async_client.llm_client._client, app.ideas.IDEAS_FILE) = originals
+        for prefix, real in real_adapters.items():
+            http_client.session.mount(prefix, real)
+        llm.stop()
+
+
+def reset_sync_state():
+    """Forgets validators and cached items so the next refresh fetches everything again."""
+    from data_sources import sync_state
+    with sync_state._lock:
+        sync_state._state = {}
+        Path(os.environ["SYNC_STATE_PATH"]).unlink(missing_ok=True)
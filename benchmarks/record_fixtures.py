@@ -0,0 +1,84 @@
+"""
+Records the responses every data source gets from the live sites into the
+benchmark cassette (needs network access and the usual API credentials).
+
+    python -m benchmarks.record_fixtures [--out benchmarks/fixtures/cassette.json]
+
+HTTP responses are captured on the shared http_client session while each fetcher
+runs once with the pipeline's arguments. Reddit (praw) and Google Trends
+(pytrends) don't use that session; their parsed results are stored instead and
+replayed by the fakes in benchmarks/offline.py.
+"""
+import argparse
+import json
+
+from benchmarks import offline
+
+# Headers that describe the wire encoding, not the (decoded) body we store
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", default=str(offline.CASSETTE))
+    args = parser.parse_args()
+
+    offline.install()  # fresh sync state, so every request is unconditional
+    from requests.adapters import HTTPAdapter
+    from data_sources import http_client, google_trends_fetcher
+    from data_sources.producthunt_fetcher import fetch_producthunt_posts
+    from app.pipeline import SOURCES
+
+    recorded = {}
+
+    class RecordingAdapter(HTTPAdapter):
+        def send(self, request, **kwargs):
+            resp = super().send(request, **kwargs)
+            resp.content  # read the body now; streamed fetchers then replay it from memory
+            recorded[f"{request.method} {request.url}"] = {
+                "status": resp.status_code,
+                "headers": {k: v for k, v in resp.headers.items() if k.lower() not in DROPPED_HEADERS},
+                "body": resp.text,
+            }
+            return resp
+
+    adapter = RecordingAdapter(pool_maxsize=16)
+    http_client.session.mount("https://", adapter)
+    http_client.session.mount("http://", adapter)
+
+    regions = {}
+    real_trending_searches = google_trends_fetcher._trending_searches
+
+    def recording_trending_searches(region):
+        df = real_trending_searches(region)
+        regions[region] = [row[0] for _, row in df.iterrows()]
+        return df
+
+    google_trends_fetcher._trending_searches = recording_trending_searches
+
+    reddit = {}
+    for key, fetch, kwargs in SOURCES:
+        items = fetch(**kwargs)
+        print(f"{key}: {len(items)} items")
+        if key == "reddit_posts":
+            for post in items:
+                reddit.setdefault(post["subreddit"], []).append({
+                    "id": post["id"], "title": post["title"], "score": post["score"], "url": post["url"],
+                    "created_utc": post["created_utc"], "num_comments": post["num_comments"],
+                    "selftext": post["selftext"], "comments": post["top_comments"],
+                })
+    print(f"producthunt: {len(fetch_producthunt_posts())} items")
+
+    cassette = {
+        "_note": "Recorded from the live sites. Re-record with: python -m benchmarks.record_fixtures",
+        "http": recorded,
+        "reddit": reddit,
+        "google_trends": regions,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(cassette, f, indent=1, ensure_ascii=False)
+    print(f"{len(recorded)} HTTP responses written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,3 +17,81 @@ PRODUCT_HUNT_TOKEN = os.environ.get("PRODUCT_HUNT_TOKEN", "")
 # (Optional) Telegram and Notion keys (for notifications or future integrations)
 TELEGRAM_BOT_TOKEN = os.environ.get("TELEGRAM_BOT_TOKEN", "")
 NOTION_API_KEY = os.environ.get("NOTION_API_KEY", "")
+
+# Refresh pipeline tuning
+# Max number of sources fetched at the same time during a refresh
+REFRESH_MAX_WORKERS = int(os.environ.get("REFRESH_MAX_WORKERS", "8"))
+# Default per-source deadline (seconds); sources still running after it are marked stale
+SOURCE_TIMEOUT = float(os.environ.get("SOURCE_TIMEOUT", "25"))
+# Adaptive deadlines: p95 of a source's recent fetch times x this, never below SOURCE_TIMEOUT_MIN
+SOURCE_TIMEOUT_P95_FACTOR = float(os.environ.get("SOURCE_TIMEOUT_P95_FACTOR", "3"))
+SOURCE_TIMEOUT_MIN = float(os.environ.get("SOURCE_TIMEOUT_MIN", "5"))
+# Circuit breaker: skip a source after this many failed refreshes in a row, for a cool-down
+# that doubles each time the source fails again (up to BREAKER_MAX_COOLDOWN seconds)
+BREAKER_FAILURES = int(os.environ.get("BREAKER_FAILURES", "3"))
+BREAKER_COOLDOWN = float(os.environ.get("BREAKER_COOLDOWN", "300"))
+BREAKER_MAX_COOLDOWN = float(os.environ.get("BREAKER_MAX_COOLDOWN", "3600"))
+
+# Background refresh scheduler (see app/scheduler.py)
+SCHEDULER_ENABLED = os.environ.get("SCHEDULER_ENABLED", "1") not in ("0", "false", "False", "")
+# Seconds between scheduled refreshes, randomized by +/- REFRESH_JITTER
+REFRESH_INTERVAL = int(os.environ.get("REFRESH_INTERVAL", str(30 * 60)))
+REFRESH_JITTER = int(os.environ.get("REFRESH_JITTER", "120"))
+# Snapshots older than this (seconds) are still served, but start a background refresh
+SNAPSHOT_TTL = int(os.environ.get("SNAPSHOT_TTL", str(15 * 60)))
+# Seconds background revalidation waits after a failed refresh (doubles per failure, up to REFRESH_INTERVAL)
+REFRESH_FAILURE_BACKOFF = int(os.environ.get("REFRESH_FAILURE_BACKOFF", "60"))
+# File locked while a refresh runs, so only one worker process (uvicorn --workers N) refreshes at a time
+REFRESH_LOCK_PATH = os.environ.get("REFRESH_LOCK_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "app", "refresh.lock"))
+
+# LLM response cache (see llm/cache.py)
+LLM_CACHE_PATH = os.environ.get("LLM_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "llm", "llm_cache.sqlite3"))
+# Seconds a cached response stays valid; 0 disables the cache
+LLM_CACHE_TTL = int(os.environ.get("LLM_CACHE_TTL", str(6 * 60 * 60)))
+# Max responses kept on disk / in the in-memory LRU
+LLM_CACHE_MAX_ENTRIES = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", "2000"))
+LLM_CACHE_MEMORY_ENTRIES = int(os.environ.get("LLM_CACHE_MEMORY_ENTRIES", "256"))
+
+# SQLite snapshot store (see app/snapshot_store.py)
+SNAPSHOT_DB_PATH = os.environ.get("SNAPSHOT_DB_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "app", "snapshots.sqlite3"))
+# Legacy single-file cache, imported into an empty snapshot store; empty to skip the import
+SNAPSHOT_LEGACY_JSON = os.environ.get("SNAPSHOT_LEGACY_JSON", os.path.join(os.path.dirname(os.path.abspath(__file__)), "app", "latest_results.json"))
+
+# Per-source sync state for incremental refreshes (see data_sources/sync_state.py)
+SYNC_STATE_PATH = os.environ.get("SYNC_STATE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_sources", "sync_state.json"))
+
+# Max subreddits fetched at the same time (Reddit allows ~100 requests/minute per OAuth client)
+REDDIT_MAX_WORKERS = int(os.environ.get("REDDIT_MAX_WORKERS", "4"))
+
+# Shared HTTP client for data_sources (see data_sources/http_client.py)
+HTTP_POOL_SIZE = int(os.environ.get("HTTP_POOL_SIZE", "32"))  # keep-alive connections kept per host
+HTTP_PER_HOST_LIMIT = int(os.environ.get("HTTP_PER_HOST_LIMIT", "16"))  # concurrent requests per host
+HTTP_RETRIES = int(os.environ.get("HTTP_RETRIES", "3"))
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("HTTP_CONNECT_TIMEOUT", "3.05"))
+HTTP_READ_TIMEOUT = float(os.environ.get("HTTP_READ_TIMEOUT", "10"))
+# Longest Retry-After (seconds) honoured per retry; keeps retries well inside the source deadline
+HTTP_MAX_RETRY_AFTER = float(os.environ.get("HTTP_MAX_RETRY_AFTER", "5"))
+# Seconds the primary Google Trends region gets before the fallback region is also requested
+TRENDS_HEDGE_DELAY = float(os.environ.get("TRENDS_HEDGE_DELAY", "3"))
+
+# RSS/Atom feeds (see data_sources/feed_parser.py)
+TECHCRUNCH_FEED_URL = os.environ.get("TECHCRUNCH_FEED_URL", "https://techcrunch.com/feed/")
+DRIBBBLE_FEED_URL = os.environ.get("DRIBBBLE_FEED_URL", "https://dribbble.com/shots/popular.rss")
+
+# Async LLM client (see llm/async_client.py)
+LLM_MAX_CONCURRENCY = int(os.environ.get("LLM_MAX_CONCURRENCY", "4"))
+# OpenRouter ":free" models allow about 20 requests per minute
+LLM_REQUESTS_PER_MINUTE = float(os.environ.get("LLM_REQUESTS_PER_MINUTE", "20"))
+LLM_BURST = int(os.environ.get("LLM_BURST", "5"))
+LLM_MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", "4"))
+
+# Input-token budget for the post content packed into idea prompts (see llm/prompt_packer.py)
+LLM_IDEAS_PROMPT_BUDGET = int(os.environ.get("LLM_IDEAS_PROMPT_BUDGET", "350"))
+
+# Local idea ranking (see app/ranking.py)
+IDEA_HISTORY_PATH = os.environ.get("IDEA_HISTORY_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "app", "idea_history.json"))
+IDEA_HISTORY_SIZE = int(os.environ.get("IDEA_HISTORY_SIZE", "500"))  # past ideas kept for the novelty score
+IDEA_RERANK_TOP_K = int(os.environ.get("IDEA_RERANK_TOP_K", "0"))  # > 0: let the LLM reorder the top k ideas
+
+# Metrics (see metrics.py): also print one JSON line per refresh, source fetch and LLM call
+METRICS_LOG_JSON = os.environ.get("METRICS_LOG_JSON", "1") not in ("0", "false", "False", "")
@@ -1,13 +1,14 @@
-import requests
+from data_sources.sync_state import conditional_get, remember_response
 
 def fetch_devto_articles(limit=5):
     """Fetches the latest/top articles from Dev.to."""
     url = f"https://dev.to/api/articles?top=1&per_page={limit}"
     try:
-        resp = requests.get(url, timeout=10)
-        resp.raise_for_status()
+        resp, cached = conditional_get("devto", url, limit=limit)
+        if resp is None:
+            return cached
         articles = resp.json()
-        return [
+        result = [
             {
                 "title": a["title"],
                 "url": a["url"],
@@ -19,5 +20,7 @@ def fetch_devto_articles(limit=5):
             }
             for a in articles
         ]
+        remember_response("devto", url, resp, result, limit=limit)
+        return result
     except Exception as e:
         return [{"title": f"[ERROR] Dev.to fetch failed: {e}"}]
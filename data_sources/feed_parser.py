@@ -0,0 +1,92 @@
+"""
+Incremental RSS/Atom parsing.
+
+The response body is fed to an XMLPullParser chunk by chunk; every finished
+<item>/<entry> is turned into a dict and its element dropped, and we stop
+reading (and close the connection) as soon as `limit` items are out. Parse time
+and memory depend on `limit`, not on the size of the feed.
+"""
+import time
+from xml.etree.ElementTree import XMLPullParser
+
+from data_sources.sync_state import conditional_get, remember_response
+from metrics import PARSE_SECONDS
+
+CHUNK_SIZE = 16 * 1024
+ITEM_TAGS = {"item", "entry"}  # RSS, Atom
+
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def _child_text(elem, *names):
+    for child in elem:
+        if _local(child.tag) in names and (child.text or "").strip():
+            return child.text.strip()
+    return ""
+
+
+def _link(elem):
+    for child in elem:
+        if _local(child.tag) != "link":
+            continue
+        # Atom: <link rel="alternate" href="..."/>, RSS: <link>...</link>
+        if child.get("href") and child.get("rel", "alternate") == "alternate":
+            return child.get("href")
+        if (child.text or "").strip():
+            return child.text.strip()
+    return ""
+
+
+def _to_item(elem):
+    return {
+        "title": _child_text(elem, "title"),
+        "url": _link(elem),
+        "description": _child_text(elem, "description", "summary", "content"),
+        "published": _child_text(elem, "pubDate", "published", "updated"),
+    }
+
+
+def iter_feed_items(chunks, limit=None):
+    """Yields item dicts from an iterable of byte chunks, stopping after `limit` items."""
+    parser = XMLPullParser(events=("start", "end"))
+    depth = 0  # >0 while inside an item, so nested tags are left to _to_item
+    count = 0
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, elem in parser.read_events():
+            if _local(elem.tag) not in ITEM_TAGS:
+                continue
+            if event == "start":
+                depth += 1
+                continue
+            depth -= 1
+            if depth:
+                continue
+            yield _to_item(elem)
+            elem.clear()
+            count += 1
+            if limit is not None and count >= limit:
+                return
+
+
+def parse_feed(content, limit=None):
+    """Parses a whole feed document (bytes)."""
+    return list(iter_feed_items([content], limit=limit))
+
+
+def fetch_feed(source, url, limit=5):
+    """
+    Streams the feed at `url` and returns its first `limit` items as
+    {"title", "url", "description", "published"} dicts.
+    Uses conditional GETs through the sync state of `source`.
+    """
+    resp, cached = conditional_get(source, url, limit=limit, stream=True)
+    if resp is None:
+        return cached
+    # CPU time, so the download interleaved with parsing isn't counted
+    with resp, PARSE_SECONDS.time(clock=time.thread_time, parser="feed"):
+        parsed = list(iter_feed_items(resp.iter_content(chunk_size=CHUNK_SIZE), limit=limit))
+    remember_response(source, url, resp, parsed, limit=limit)
+    return parsed
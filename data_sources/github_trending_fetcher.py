@@ -1,29 +1,145 @@
-import requests
-from bs4 import BeautifulSoup
+import codecs
+import time
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import quote
 
-def fetch_github_trending(limit=5):
-    """Fetch trending repositories from GitHub Trending."""
-    url = "https://github.com/trending"
+from data_sources.sync_state import conditional_get, remember_response
+from metrics import PARSE_SECONDS
+
+TRENDING_URL = "https://github.com/trending"
+DATE_RANGES = ("daily", "weekly", "monthly")
+CHUNK_SIZE = 16 * 1024
+
+
+class _Done(Exception):
+    pass
+
+
+class TrendingParser(HTMLParser):
+    """
+    Tokenizer-level extractor for the GitHub Trending page.
+    Only tags inside <article class="Box-row"> are looked at; everything else is
+    skipped as it streams past, and parsing stops after `limit` rows.
+    """
+
+    def __init__(self, limit=None):
+        super().__init__()
+        self.limit = limit
+        self.repos = []
+        self._row = None
+        self._in_h2 = False
+        self._capture = None  # (field, tag, nesting depth of that tag)
+        self._pieces = []
+
+    def _start_capture(self, field, tag):
+        self._capture = [field, tag, 1]
+        self._pieces = []
+
+    def handle_starttag(self, tag, attrs):
+        if self._row is None:
+            if tag == "article" and "Box-row" in (dict(attrs).get("class") or "").split():
+                self._row = {"title": "", "href": "", "description": None, "language": "", "stars": None}
+            return
+        if self._capture:
+            if tag == self._capture[1]:
+                self._capture[2] += 1
+            return
+        attrs = dict(attrs)
+        row = self._row
+        if tag == "h2":
+            self._in_h2 = True
+        elif tag == "a" and self._in_h2 and not row["href"]:
+            row["href"] = attrs.get("href") or ""
+            self._start_capture("title", "a")
+        elif tag == "p" and row["description"] is None:
+            self._start_capture("description", "p")
+        elif tag == "span" and attrs.get("itemprop") == "programmingLanguage":
+            self._start_capture("language", "span")
+        elif (tag == "a" and row["stars"] is None and (attrs.get("href") or "").endswith("/stargazers")
+              and "Link--muted" in (attrs.get("class") or "").split()):
+            self._start_capture("stars", "a")
+
+    def handle_endtag(self, tag):
+        if self._row is None:
+            return
+        if self._capture:
+            if tag == self._capture[1]:
+                self._capture[2] -= 1
+                if not self._capture[2]:
+                    self._row[self._capture[0]] = "".join(piece.strip() for piece in self._pieces)
+                    self._capture = None
+            return
+        if tag == "h2":
+            self._in_h2 = False
+        elif tag == "article":
+            self._finish_row()
+
+    def handle_data(self, data):
+        if self._capture:
+            self._pieces.append(data)
+
+    def _finish_row(self):
+        row = self._row
+        self._row = None
+        self.repos.append({
+            "title": "".join(row["title"].split()),
+            "url": f"https://github.com{row['href']}",
+            "description": row["description"] or "",
+            "language": row["language"],
+            "stars": row["stars"] or "0"
+        })
+        if self.limit is not None and len(self.repos) >= self.limit:
+            raise _Done()
+
+
+def parse_trending(chunks, limit=None):
+    """Extracts repo rows from an iterable of HTML text (or bytes) chunks, stopping after `limit` rows."""
+    if isinstance(chunks, (str, bytes)):
+        chunks = [chunks]
+    parser = TrendingParser(limit=limit)
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    try:
+        for chunk in chunks:
+            parser.feed(decoder.decode(chunk) if isinstance(chunk, bytes) else chunk)
+        parser.close()
+    except _Done:
+        pass
+    return parser.repos
+
+
+def trending_url(language=None, since="daily"):
+    if since not in DATE_RANGES:
+        raise ValueError(f"since must be one of {DATE_RANGES}, got {since!r}")
+    url = f"{TRENDING_URL}/{quote(language.lower(), safe='')}" if language else TRENDING_URL
+    return url if since == "daily" else f"{url}?since={since}"
+
+
+def fetch_github_trending(limit=5, language=None, since="daily"):
+    """Fetch trending repositories from GitHub Trending, optionally for one language and date range."""
+    source = "github_trending" if not language and since == "daily" else f"github_trending:{language or ''}:{since}"
     try:
-        resp = requests.get(url, timeout=10)
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
-        repos = []
-        for repo in soup.select("article.Box-row")[:limit]:
-            title = repo.h2.a.get_text(strip=True).replace("\n", "").replace(" ", "")
-            href = repo.h2.a["href"]
-            desc = repo.p.get_text(strip=True) if repo.p else ""
-            lang = repo.find("span", itemprop="programmingLanguage")
-            lang = lang.get_text(strip=True) if lang else ""
-            stars = repo.select_one("a.Link--muted[href$='/stargazers']")
-            stars = stars.get_text(strip=True) if stars else "0"
-            repos.append({
-                "title": title,
-                "url": f"https://github.com{href}",
-                "description": desc,
-                "language": lang,
-                "stars": stars
-            })
+        url = trending_url(language, since)
+        resp, cached = conditional_get(source, url, limit=limit, stream=True)
+        if resp is None:
+            return cached
+        with resp, PARSE_SECONDS.time(clock=time.thread_time, parser="github_trending"):
+            repos = parse_trending(resp.iter_content(chunk_size=CHUNK_SIZE), limit=limit)
+        remember_response(source, url, resp, repos, limit=limit)
         return repos
     except Exception as e:
         return [{"title": f"[ERROR] GitHub Trending fetch failed: {e}"}]
+
+
+def fetch_github_trending_views(views, limit=5):
+    """
+    Fetches several trending views at once.
+    views: iterable of (language or None, since) pairs
+    Returns: {"<language or all>/<since>": [repos]}
+    """
+    views = list(views)
+    if not views:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(views), thread_name_prefix="github-trending") as pool:
+        results = pool.map(lambda view: fetch_github_trending(limit, *view), views)
+        return {f"{language or 'all'}/{since}": repos for (language, since), repos in zip(views, results)}
@@ -1,18 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
 from pytrends.request import TrendReq
 
-def fetch_trending_searches(region="united_states", limit=5):
-    pytrends = TrendReq(hl='en-US', tz=360)
+from config import HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT, TRENDS_HEDGE_DELAY
+
+
+def _trending_searches(region):
+    # TrendReq keeps per-instance session state, so each region gets its own
+    pytrends = TrendReq(hl='en-US', tz=360, timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT))
+    return pytrends.trending_searches(pn=region)
+
+
+def fetch_trending_searches(region="united_states", limit=5, fallback_region="united_kingdom",
+                            hedge_delay=TRENDS_HEDGE_DELAY):
+    """
+    Trending searches for `region`. The fallback region is only requested once the
+    first one failed or is still pending after `hedge_delay` seconds (the endpoint
+    is heavily rate limited); then whichever answers first wins.
+    """
+    pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="trends")
+    pending = {pool.submit(_trending_searches, region)}
+    fallback = fallback_region if fallback_region and fallback_region != region else None
+    error = None
+    df = None
     try:
-        df = pytrends.trending_searches(pn=region)
-    except Exception as e:
-        # Try fallback region if US fails
-        if region == "united_states":
-            try:
-                df = pytrends.trending_searches(pn="united_kingdom")
-            except Exception as e2:
-                return [{"title": f"[ERROR] Google Trends fetch failed: {e2}"}]
-        else:
-            return [{"title": f"[ERROR] Google Trends fetch failed: {e}"}]
+        done, pending = wait(pending, timeout=hedge_delay)
+        while df is None:
+            for future in done:
+                try:
+                    df = future.result()
+                    break
+                except Exception as e:
+                    error = e
+            if df is not None:
+                break
+            if fallback:
+                pending.add(pool.submit(_trending_searches, fallback))
+                fallback = None
+            if not pending:
+                return [{"title": f"[ERROR] Google Trends fetch failed: {error}"}]
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+    finally:
+        # Don't wait for the other region once one answered
+        pool.shutdown(wait=False)
     trends = []
     for idx, row in df.iterrows():
         if idx >= limit:
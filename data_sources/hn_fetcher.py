@@ -1,20 +1,70 @@
-import requests
+from concurrent.futures import ThreadPoolExecutor
+
+from data_sources import http_client
+from data_sources.sync_state import get_state, update_state
+
+BASE_URL = "https://hacker-news.firebaseio.com/v0"
+MAX_CONCURRENCY = 16
+
+
+def _get_item(item_id):
+    try:
+        resp = http_client.get(f"{BASE_URL}/item/{item_id}.json")
+        resp.raise_for_status()
+        return resp.json()
+    except Exception as e:
+        print(f"[ERROR] HN item {item_id} fetch failed: {e}")
+        return None
+
+
+def fetch_items(item_ids, max_workers=MAX_CONCURRENCY):
+    """Fetches HN items in parallel; returns them in the order of item_ids (None for failures)."""
+    if not item_ids:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(item_ids))) as pool:
+        return list(pool.map(_get_item, item_ids))
+
 
 def fetch_top_stories(limit=10, top_comments=5):
-    base_url = "https://hacker-news.firebaseio.com/v0"
-    top_ids = requests.get(f"{base_url}/topstories.json").json()[:limit]
-    stories = []
-    for story_id in top_ids:
-        story = requests.get(f"{base_url}/item/{story_id}.json").json()
-        if not story or story.get('type') != 'story':
-            continue
-        comments = []
-        if 'kids' in story:
-            for comment_id in story['kids'][:top_comments]:
-                comment = requests.get(f"{base_url}/item/{comment_id}.json").json()
+    resp = http_client.get(f"{BASE_URL}/topstories.json")
+    resp.raise_for_status()
+    top_ids = resp.json()[:limit]
+
+    # Wave 1: every story item at once
+    stories = [
+        (story_id, story)
+        for story_id, story in zip(top_ids, fetch_items(top_ids))
+        if story and story.get('type') == 'story'
+    ]
+
+    # Comments are reused for stories whose first comment ids haven't changed since last refresh
+    known = get_state("hn").get("comments", {})
+    changed = [
+        (story_id, story) for story_id, story in stories
+        if known.get(str(story_id), {}).get("kids") != story.get('kids', [])[:top_comments]
+    ]
+
+    # Wave 2: the first comments of every new or changed story at once
+    comment_ids = [cid for _, story in changed for cid in story.get('kids', [])[:top_comments]]
+    comments_by_id = dict(zip(comment_ids, fetch_items(comment_ids)))
+
+    results = []
+    seen = {}
+    for story_id, story in stories:
+        kids = story.get('kids', [])[:top_comments]
+        if known.get(str(story_id), {}).get("kids") == kids:
+            comments = known[str(story_id)]["comments"]
+            seen[str(story_id)] = known[str(story_id)]
+        else:
+            comments = []
+            for comment_id in kids:
+                comment = comments_by_id.get(comment_id)
                 if comment and comment.get('text'):
                     comments.append(comment['text'])
-        stories.append({
+            # Stories with failed comment fetches are retried next time
+            if all(comments_by_id.get(cid) is not None for cid in kids):
+                seen[str(story_id)] = {"kids": kids, "comments": comments}
+        results.append({
             'title': story.get('title', ''),
             'url': story.get('url', ''),
             'score': story.get('score', 0),
@@ -23,7 +73,8 @@ def fetch_top_stories(limit=10, top_comments=5):
             'text': story.get('text', ''),
             'top_comments': comments
         })
-    return stories
+    update_state("hn", comments=seen)
+    return results
 
 if __name__ == "__main__":
     stories = fetch_top_stories(limit=3)
@@ -0,0 +1,100 @@
+"""
+Shared HTTP client for every fetcher in data_sources.
+
+One requests.Session with keep-alive pools, so fetchers stop paying a TCP+TLS
+handshake per request; retries with jittered exponential backoff on connection
+errors, 429 and 5xx; gzip/deflate; a default (connect, read) timeout; and a cap
+on concurrent requests per host. aget/apost run the same calls from asyncio code.
+"""
+import asyncio
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import (
+    HTTP_POOL_SIZE, HTTP_PER_HOST_LIMIT, HTTP_RETRIES,
+    HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT, HTTP_MAX_RETRY_AFTER,
+)
+
+DEFAULT_TIMEOUT = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+DEFAULT_HEADERS = {
+    "User-Agent": "AppGeneratorBot/0.1",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+
+class CappedRetry(Retry):
+    """Retry that honours Retry-After, but never sleeps longer than HTTP_MAX_RETRY_AFTER per attempt."""
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, HTTP_MAX_RETRY_AFTER)
+
+
+def _retry_policy():
+    kwargs = dict(
+        total=HTTP_RETRIES,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    try:
+        return CappedRetry(backoff_jitter=0.5, **kwargs)
+    except TypeError:
+        # urllib3 < 2 has no backoff_jitter
+        return CappedRetry(**kwargs)
+
+
+def _build_session():
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=HTTP_POOL_SIZE, max_retries=_retry_policy())
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+session = _build_session()
+
+_host_limits = {}
+_host_limits_lock = threading.Lock()
+
+
+def _host_limit(url):
+    host = urlsplit(url).netloc
+    with _host_limits_lock:
+        if host not in _host_limits:
+            _host_limits[host] = threading.BoundedSemaphore(HTTP_PER_HOST_LIMIT)
+        return _host_limits[host]
+
+
+def request(method, url, **kwargs):
+    """Like requests.request, through the shared pool and per-host limit."""
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    with _host_limit(url):
+        return session.request(method, url, **kwargs)
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+async def arequest(method, url, **kwargs):
+    return await asyncio.to_thread(request, method, url, **kwargs)
+
+
+async def aget(url, **kwargs):
+    return await arequest("GET", url, **kwargs)
+
+
+async def apost(url, **kwargs):
+    return await arequest("POST", url, **kwargs)
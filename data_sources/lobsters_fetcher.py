@@ -1,13 +1,14 @@
-import requests
+from data_sources.sync_state import conditional_get, remember_response
 
 def fetch_lobsters_stories(limit=5):
     """Fetches the latest/top stories from Lobsters."""
     url = f"https://lobste.rs/hottest.json"
     try:
-        resp = requests.get(url, timeout=10)
-        resp.raise_for_status()
+        resp, cached = conditional_get("lobsters", url, limit=limit)
+        if resp is None:
+            return cached
         stories = resp.json()[:limit]
-        return [
+        result = [
             {
                 "title": s["title"],
                 "url": s["url"],
@@ -19,5 +20,7 @@ def fetch_lobsters_stories(limit=5):
             }
             for s in stories
         ]
+        remember_response("lobsters", url, resp, result, limit=limit)
+        return result
     except Exception as e:
         return [{"title": f"[ERROR] Lobsters fetch failed: {e}"}]
@@ -1,5 +1,4 @@
-import requests
-import os
+from data_sources import http_client
 from config import PRODUCT_HUNT_TOKEN
 
 def fetch_producthunt_posts(limit=5):
@@ -12,7 +11,7 @@ def fetch_producthunt_posts(limit=5):
     query = '{ posts(order: VOTES, first: %d) { edges { node { name tagline url votesCount commentsCount } } } }' % limit
     data = {"query": query}
     try:
-        resp = requests.post(url, headers=headers, json=data, timeout=10)
+        resp = http_client.post(url, headers=headers, json=data)
         resp.raise_for_status()
         posts = resp.json()["data"]["posts"]["edges"]
         return [
@@ -1,31 +1,71 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import praw
-from config import REDDIT_CLIENT_ID, REDDIT_CLIENT_SECRET
+from config import REDDIT_CLIENT_ID, REDDIT_CLIENT_SECRET, REDDIT_MAX_WORKERS
+from data_sources.sync_state import get_state, update_state
+
+# PRAW instances aren't thread-safe, so each pool thread keeps its own long-lived client
+_local = threading.local()
+_pool = ThreadPoolExecutor(max_workers=REDDIT_MAX_WORKERS, thread_name_prefix="reddit")
 
 def get_reddit_client():
-    return praw.Reddit(
-        client_id=REDDIT_CLIENT_ID,
-        client_secret=REDDIT_CLIENT_SECRET,
-        user_agent="AppGeneratorBot/0.1 by YourUsername"
-    )
+    reddit = getattr(_local, "reddit", None)
+    if reddit is None:
+        reddit = praw.Reddit(
+            client_id=REDDIT_CLIENT_ID,
+            client_secret=REDDIT_CLIENT_SECRET,
+            user_agent="AppGeneratorBot/0.1 by YourUsername"
+        )
+        _local.reddit = reddit
+    return reddit
 
-def fetch_top_posts(subreddits, limit=10, time_filter="day", top_comments=5):
+def _top_comments(post, top_comments):
+    # Ask Reddit for only the first N top-level comments instead of the whole tree
+    post.comment_sort = "top"
+    post.comment_limit = top_comments
+    post.comments.replace_more(limit=0)
+    return [comment.body for comment in post.comments[:top_comments]]
+
+def _fetch_subreddit(subreddit, limit, time_filter, top_comments, known):
     reddit = get_reddit_client()
     posts = []
-    for subreddit in subreddits:
-        for post in reddit.subreddit(subreddit).top(time_filter=time_filter, limit=limit):
-            post.comments.replace_more(limit=0)
-            comments = [comment.body for comment in post.comments[:top_comments]]
-            posts.append({
-                "title": post.title,
-                "score": post.score,
-                "url": post.url,
-                "id": post.id,
-                "subreddit": subreddit,
-                "created_utc": post.created_utc,
-                "num_comments": post.num_comments,
-                "selftext": post.selftext,
-                "top_comments": comments
-            })
+    seen = {}
+    for post in reddit.subreddit(subreddit).top(time_filter=time_filter, limit=limit):
+        # Comments are only loaded for posts that are new or whose comment count changed
+        previous = known.get(post.id, {})
+        if previous.get("num_comments") == post.num_comments and previous.get("top_comments") == top_comments:
+            comments = previous["comments"]
+        else:
+            comments = _top_comments(post, top_comments)
+        seen[post.id] = {"num_comments": post.num_comments, "top_comments": top_comments, "comments": comments}
+        posts.append({
+            "title": post.title,
+            "score": post.score,
+            "url": post.url,
+            "id": post.id,
+            "subreddit": subreddit,
+            "created_utc": post.created_utc,
+            "num_comments": post.num_comments,
+            "selftext": post.selftext,
+            "top_comments": comments
+        })
+    return posts, seen
+
+def fetch_top_posts(subreddits, limit=10, time_filter="day", top_comments=5):
+    """Fetches the top posts of every subreddit concurrently (at most REDDIT_MAX_WORKERS at a time)."""
+    known = get_state("reddit").get("comments", {})
+    futures = [
+        _pool.submit(_fetch_subreddit, subreddit, limit, time_filter, top_comments, known)
+        for subreddit in subreddits
+    ]
+    posts = []
+    seen = {}
+    for future in futures:
+        subreddit_posts, subreddit_seen = future.result()
+        posts.extend(subreddit_posts)
+        seen.update(subreddit_seen)
+    update_state("reddit", comments=seen)
     return posts
 
 if __name__ == "__main__":
@@ -0,0 +1,57 @@
+"""
+Registry of the data sources fetched on refresh.
+
+Fetchers are named as "module:function" and only imported the first time they
+are called, so importing the web app or the CLI doesn't pull in praw, pytrends
+(and pandas) or bs4 until a refresh needs them. A fetcher whose module, or one
+of its dependencies, fails to import returns an "[ERROR] ..." row like any other
+failed fetch instead of breaking every entry point.
+"""
+import importlib
+
+SUBREDDITS = ["startups", "entrepreneur", "InternetIsBeautiful", "AskReddit"]
+
+
+class LazyFetcher:
+    def __init__(self, target):
+        self.target = target
+        self._func = None
+
+    def resolve(self):
+        """Imports the fetcher (once); raises ImportError if it can't be."""
+        if self._func is None:
+            module, _, name = self.target.partition(":")
+            self._func = getattr(importlib.import_module(module), name)
+        return self._func
+
+    def __call__(self, *args, **kwargs):
+        try:
+            fetch = self.resolve()
+        except ImportError as e:
+            print(f"[ERROR] {self.target} unavailable: {e}")
+            return [{"title": f"[ERROR] {self.target} unavailable: {e}"}]
+        return fetch(*args, **kwargs)
+
+    def __repr__(self):
+        return f"LazyFetcher({self.target!r})"
+
+
+# (cache key, fetcher, kwargs) for every source fetched on refresh
+SOURCES = [
+    ("reddit_posts", LazyFetcher("data_sources.reddit_fetcher:fetch_top_posts"), {"subreddits": SUBREDDITS, "limit": 5}),
+    ("hn_stories", LazyFetcher("data_sources.hn_fetcher:fetch_top_stories"), {"limit": 5}),
+    ("devto_articles", LazyFetcher("data_sources.devto_fetcher:fetch_devto_articles"), {"limit": 5}),
+    ("lobsters_stories", LazyFetcher("data_sources.lobsters_fetcher:fetch_lobsters_stories"), {"limit": 5}),
+    ("github_trending", LazyFetcher("data_sources.github_trending_fetcher:fetch_github_trending"), {"limit": 5}),
+    ("dribbble_shots", LazyFetcher("data_sources.dribbble_fetcher:fetch_dribbble_shots"), {"limit": 5}),
+    ("techcrunch_articles", LazyFetcher("data_sources.techcrunch_fetcher:fetch_techcrunch_articles"), {"limit": 5}),
+    ("trends", LazyFetcher("data_sources.google_trends_fetcher:fetch_trending_searches"), {"limit": 5}),
+]
+
+
+def get_fetcher(key):
+    """The (fetcher, default kwargs) registered for `key`."""
+    for source_key, fetch, kwargs in SOURCES:
+        if source_key == key:
+            return fetch, kwargs
+    raise KeyError(key)
@@ -0,0 +1,102 @@
+"""
+Per-source sync state so a refresh only pays for what changed upstream.
+
+For each source we remember the validators of the last response (ETag /
+Last-Modified) together with the items parsed from it, so the next request can
+be conditional and a 304 reuses those items. Sources with comments also keep
+the comments already fetched per item, keyed by what the item looked like, so
+comments are only fetched again for items that are new or changed.
+
+The file is shared by every worker process: it is re-read whenever another
+process replaced it, so a worker's save doesn't drop what the others stored
+(refreshes themselves are serialized by the inter-process lock in app/scheduler.py).
+"""
+import json
+import os
+import threading
+
+from config import SYNC_STATE_PATH
+from data_sources import http_client
+
+_lock = threading.Lock()
+_state = None
+_signature = None  # (mtime_ns, size) of the file _state was read from or written to
+
+
+def _file_signature():
+    try:
+        st = os.stat(SYNC_STATE_PATH)
+        return st.st_mtime_ns, st.st_size
+    except OSError:
+        return None
+
+
+def _load():
+    global _state, _signature
+    signature = _file_signature()
+    if _state is None or (signature is not None and signature != _signature):
+        try:
+            with open(SYNC_STATE_PATH, "r", encoding="utf-8") as f:
+                _state = json.load(f)
+        except (OSError, ValueError):
+            _state = {}
+        _signature = signature
+    return _state
+
+
+def _save():
+    global _signature
+    tmp_path = f"{SYNC_STATE_PATH}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(_state, f, ensure_ascii=False)
+    os.replace(tmp_path, SYNC_STATE_PATH)
+    _signature = _file_signature()
+
+
+def get_state(source):
+    with _lock:
+        return dict(_load().get(source, {}))
+
+
+def update_state(source, **fields):
+    with _lock:
+        _load().setdefault(source, {}).update(fields)
+        try:
+            _save()
+        except OSError as e:
+            print(f"[ERROR] Could not save sync state: {e}")
+
+
+def conditional_get(source, url, limit=None, session=http_client, **kwargs):
+    """
+    GETs `url` with the validators stored for `source`.
+    Returns (response, cached_items): on 304 the response is None and cached_items holds
+    the items saved by remember_response(); otherwise cached_items is None.
+    Cached items are only reused if they were fetched with the same url and limit.
+    """
+    state = get_state(source)
+    headers = dict(kwargs.pop("headers", {}) or {})
+    reusable = state.get("url") == url and state.get("limit") == limit and "items" in state
+    if reusable:
+        if state.get("etag"):
+            headers["If-None-Match"] = state["etag"]
+        if state.get("last_modified"):
+            headers["If-Modified-Since"] = state["last_modified"]
+    resp = session.get(url, headers=headers, **kwargs)
+    if resp.status_code == 304 and reusable:
+        return None, state["items"]
+    resp.raise_for_status()
+    return resp, None
+
+
+def remember_response(source, url, resp, items, limit=None, **fields):
+    """Stores the validators of `resp` along with the items parsed from it."""
+    update_state(
+        source,
+        url=url,
+        limit=limit,
+        etag=resp.headers.get("ETag"),
+        last_modified=resp.headers.get("Last-Modified"),
+        items=items,
+        **fields,
+    )
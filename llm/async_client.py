@@ -0,0 +1,166 @@
+"""
+Async OpenRouter client for running many prompts at once.
+
+- at most LLM_MAX_CONCURRENCY requests in flight
+- identical prompts that are already in flight share one request (single-flight)
+- a token bucket keeps us under the requests-per-minute limit of the ":free" tier,
+  and a 429 pauses the whole bucket for Retry-After before the call is retried
+- responses go through the response cache (llm/cache.py)
+- the SDK's own retries are off, so every 429 goes through the token bucket
+
+Everything runs on one background event loop, so synchronous callers (the
+refresh pipeline, dashboard threads) share the limits and the in-flight map;
+use generate_many() from sync code.
+"""
+import asyncio
+import threading
+import time
+
+from config import LLM_MAX_CONCURRENCY, LLM_REQUESTS_PER_MINUTE, LLM_BURST, LLM_MAX_RETRIES
+from llm.cache import make_key, response_cache
+from llm.prompt_packer import count_tokens
+from llm import usage
+from metrics import LLM_REQUEST_SECONDS, log_event
+from llm.openrouter_llama import OPENROUTER_API_KEY, OPENROUTER_BASE_URL, MODEL, EXTRA_HEADERS
+
+
+class TokenBucket:
+    def __init__(self, requests_per_minute, capacity):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds):
+        """Stops handing out tokens for `seconds` (after a 429)."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+
+
+def _retry_after(error, attempt):
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return max(float(headers.get("retry-after")), 0.0)
+    except (TypeError, ValueError):
+        pass
+    try:
+        # OpenRouter also sends the reset time as epoch milliseconds
+        return max(float(headers.get("x-ratelimit-reset")) / 1000 - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return float(2 ** attempt)
+
+
+class AsyncLLMClient:
+    def __init__(self, model=MODEL, max_concurrency=LLM_MAX_CONCURRENCY,
+                 requests_per_minute=LLM_REQUESTS_PER_MINUTE, burst=LLM_BURST, max_retries=LLM_MAX_RETRIES):
+        self.model = model
+        self.max_retries = max_retries
+        self.bucket = TokenBucket(requests_per_minute, burst)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._inflight = {}
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            from openai import AsyncOpenAI  # imported on first use; it's slow to import
+            self._client = AsyncOpenAI(base_url=OPENROUTER_BASE_URL, api_key=OPENROUTER_API_KEY, max_retries=0)
+        return self._client
+
+    async def generate(self, prompt, max_tokens=512, temperature=0.8, use_cache=True):
+        """The reply text, or None if the call failed."""
+        key = make_key(self.model, prompt, max_tokens, temperature)
+        if use_cache:
+            cached = await asyncio.to_thread(response_cache.get, key)
+            if cached is not None:
+                return cached
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._complete(prompt, max_tokens, temperature))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+            content = await asyncio.shield(task)
+            if use_cache and content:
+                await asyncio.to_thread(response_cache.set, key, content)
+            return content
+        return await asyncio.shield(task)
+
+    async def _complete(self, prompt, max_tokens, temperature):
+        from openai import RateLimitError
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                await self.bucket.acquire()
+                started = time.perf_counter()
+                try:
+                    completion = await self.client.chat.completions.create(
+                        extra_headers=EXTRA_HEADERS,
+                        model=self.model,
+                        messages=[{"role": "user", "content": prompt}],
+                        max_tokens=max_tokens,
+                        temperature=temperature,
+                    )
+                    elapsed = time.perf_counter() - started
+                    LLM_REQUEST_SECONDS.observe(elapsed, outcome="ok")
+                    usage.record(completion, prompt_estimate=count_tokens(prompt), elapsed=round(elapsed, 3))
+                    return completion.choices[0].message.content
+                except RateLimitError as e:
+                    LLM_REQUEST_SECONDS.observe(time.perf_counter() - started, outcome="rate_limited")
+                    wait = _retry_after(e, attempt)
+                    log_event("llm_rate_limited", attempt=attempt, retry_in=round(wait, 1))
+                    print(f"[WARN] OpenRouter rate limited, retrying in {wait:.1f}s")
+                    self.bucket.pause(wait)
+                except Exception as e:
+                    LLM_REQUEST_SECONDS.observe(time.perf_counter() - started, outcome="error")
+                    log_event("llm_error", error=str(e))
+                    print(f"[ERROR] OpenRouter API call failed: {e}")
+                    return None
+            print(f"[ERROR] OpenRouter API call failed: still rate limited after {self.max_retries} retries")
+            return None
+
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop():
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="llm-client", daemon=True).start()
+        return _loop
+
+
+def run(coro):
+    """Runs `coro` on the shared LLM event loop and waits for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+
+llm_client = AsyncLLMClient()
+
+
+def generate_many(requests):
+    """
+    Runs several prompts concurrently from synchronous code.
+    requests: list of dicts with generate() keyword arguments (prompt, max_tokens, temperature)
+    Returns: list of replies (None for failed calls), in the same order
+    """
+    async def gather():
+        return await asyncio.gather(*(llm_client.generate(**request) for request in requests))
+    return run(gather())
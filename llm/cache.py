@@ -0,0 +1,127 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from config import LLM_CACHE_PATH, LLM_CACHE_TTL, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_MEMORY_ENTRIES
+from metrics import LLM_CACHE
+
+
+def make_key(model, prompt, max_tokens, temperature):
+    """Stable cache key for one completion request."""
+    raw = json.dumps([model, prompt, max_tokens, temperature], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-level cache for LLM responses: an in-memory LRU in front of a SQLite store.
+    Entries expire after `ttl` seconds; the disk store is trimmed to `max_entries`
+    by evicting the least recently used rows.
+    """
+
+    def __init__(self, path=LLM_CACHE_PATH, ttl=LLM_CACHE_TTL,
+                 max_entries=LLM_CACHE_MAX_ENTRIES, memory_entries=LLM_CACHE_MEMORY_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()  # key -> (value, created_at)
+        self._lock = threading.Lock()
+        self._conn = None
+
+    @property
+    def enabled(self):
+        return self.ttl > 0
+
+    def _db(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+            self._conn.commit()
+        return self._conn
+
+    def _remember(self, key, value, created_at):
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and now - entry[1] < self.ttl:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                LLM_CACHE.inc(result="hit")
+                return entry[0]
+            self._memory.pop(key, None)
+            try:
+                db = self._db()
+                row = db.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+                if row and now - row[1] < self.ttl:
+                    db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                    db.commit()
+                    self._remember(key, row[0], row[1])
+                    self.hits += 1
+                    LLM_CACHE.inc(result="hit")
+                    return row[0]
+            except sqlite3.Error as e:
+                print(f"[ERROR] LLM cache read failed: {e}")
+            self.misses += 1
+            LLM_CACHE.inc(result="miss")
+            return None
+
+    def set(self, key, value):
+        if not self.enabled:
+            return
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            try:
+                db = self._db()
+                db.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, value, now, now),
+                )
+                db.execute("DELETE FROM responses WHERE created_at <= ?", (now - self.ttl,))
+                db.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+                db.commit()
+            except sqlite3.Error as e:
+                print(f"[ERROR] LLM cache write failed: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            try:
+                db = self._db()
+                db.execute("DELETE FROM responses")
+                db.commit()
+            except sqlite3.Error as e:
+                print(f"[ERROR] LLM cache clear failed: {e}")
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "memory_entries": len(self._memory),
+        }
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,85 @@
+"""
+Token-budget prompt packing.
+
+Instead of fixed character cuts, posts are ranked by engagement (score, votes,
+reactions, stars, comments) and added to the prompt, most engaging first, until
+an input-token budget is used up. A post that doesn't fit in full is retried in
+shorter forms (without its comment, then title only).
+"""
+import math
+import re
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:  # tiktoken is optional
+    _encoding = None
+
+_WORD_RE = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+
+def count_tokens(text):
+    """Token count of `text` (tiktoken when installed, otherwise a word/punctuation estimate)."""
+    if not text:
+        return 0
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    # Long words split into several BPE tokens; ~4 characters per token is the usual rule
+    return sum(max(1, math.ceil(len(piece) / 4)) for piece in _WORD_RE.findall(text))
+
+
+def truncate_to_tokens(text, max_tokens):
+    text = " ".join((text or "").split())
+    if count_tokens(text) <= max_tokens:
+        return text
+    words = text.split(" ")
+    lo, hi = 0, len(words)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if count_tokens(" ".join(words[:mid]) + "…") <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+    return " ".join(words[:lo]) + "…" if lo else ""
+
+
+def _number(value):
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(str(value).replace(",", "").strip() or 0)
+    except ValueError:
+        return 0
+
+
+def engagement(item):
+    """Engagement signal of one post: votes of any kind plus weighted comment counts."""
+    if "engagement" in item:
+        return item["engagement"]
+    votes = sum(_number(item.get(field, 0)) for field in ("score", "votes", "positive_reactions_count", "stars"))
+    comments = sum(_number(item.get(field, 0)) for field in ("num_comments", "comments_count", "comments"))
+    return votes + 2 * comments + len(item.get("top_comments") or [])
+
+
+def rank(items):
+    """Items by engagement, highest first (stable for ties)."""
+    return sorted(items, key=engagement, reverse=True)
+
+
+def pack(candidates, budget):
+    """
+    Fills `budget` tokens.
+    candidates: iterable of variant lists, one per item in priority order, longest variant first
+    Returns: (chosen texts, tokens used)
+    """
+    chosen = []
+    used = 0
+    for variants in candidates:
+        for text in variants:
+            tokens = count_tokens(text)
+            if text and used + tokens <= budget:
+                chosen.append(text)
+                used += tokens
+                break
+    return chosen, used
+
@@ -0,0 +1,28 @@
+"""Per-call token accounting for LLM requests."""
+import threading
+
+from metrics import LLM_TOKENS, log_event
+
+_lock = threading.Lock()
+totals = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+
+
+def record(completion, prompt_estimate=None, elapsed=None):
+    """Accumulates the token usage reported with an OpenAI-style completion and logs an "llm_call" event."""
+    usage = getattr(completion, "usage", None)
+    prompt_tokens = getattr(usage, "prompt_tokens", None) or 0
+    completion_tokens = getattr(usage, "completion_tokens", None) or 0
+    with _lock:
+        totals["calls"] += 1
+        totals["prompt_tokens"] += prompt_tokens
+        totals["completion_tokens"] += completion_tokens
+    LLM_TOKENS.inc(prompt_tokens, type="prompt")
+    LLM_TOKENS.inc(completion_tokens, type="completion")
+    log_event("llm_call", model=getattr(completion, "model", None), latency=elapsed,
+              prompt_tokens=prompt_tokens, prompt_estimate=prompt_estimate, completion_tokens=completion_tokens)
+    return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens}
+
+
+def get_totals():
+    with _lock:
+        return dict(totals)
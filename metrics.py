@@ -0,0 +1,133 @@
+"""
+Minimal Prometheus-style metrics and structured logs, shared by app/, llm/ and data_sources/.
+
+Counters and histograms live in one registry; render() returns them in the
+Prometheus text exposition format (served on /metrics). log_event() writes one
+JSON object per line to stdout when METRICS_LOG_JSON is on.
+"""
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from config import METRICS_LOG_JSON
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 60)
+
+_registry = []
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(tuple(str(labels.get(name, "")) for name in self.labelnames), 0)
+
+    def collect(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            series = self._series.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+            index = bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, clock=time.perf_counter, **labels):
+        """Observes the duration of the `with` block (wall time; pass clock=time.thread_time for CPU time)."""
+        started = clock()
+        try:
+            yield
+        finally:
+            self.observe(clock() - started, **labels)
+
+    def count(self, **labels):
+        series = self._series.get(tuple(str(labels.get(name, "")) for name in self.labelnames))
+        return series[-1] if series else 0
+
+    def collect(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, series):
+                    cumulative += count
+                    le = _format_labels(self.labelnames, key, [("le", _format_value(float(bound)))])
+                    lines.append(f"{self.name}_bucket{le} {cumulative}")
+                le = _format_labels(self.labelnames, key, [("le", "+Inf")])
+                lines.append(f"{self.name}_bucket{le} {series[-1]}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(series[-2])}")
+                lines.append(f"{self.name}_count{labels} {series[-1]}")
+        return lines
+
+
+def render():
+    """All metrics in the Prometheus text format (version 0.0.4)."""
+    return "\n".join(line for metric in _registry for line in metric.collect()) + "\n"
+
+
+def log_event(event, **fields):
+    """One structured log line: {"ts", "event", **fields}."""
+    if METRICS_LOG_JSON:
+        print(json.dumps({"ts": round(time.time(), 3), "event": event, **fields}, default=str), flush=True)
+
+
+# Refresh pipeline
+REFRESH_SECONDS = Histogram("appgen_refresh_seconds", "Duration of a full refresh (fetch + ideas + save)")
+SOURCE_FETCH_SECONDS = Histogram("appgen_source_fetch_seconds", "Fetch time per source", ["source"])
+SOURCE_ERRORS = Counter("appgen_source_errors_total", "Failed or skipped source fetches", ["source", "kind"])
+PARSE_SECONDS = Histogram("appgen_parse_seconds", "CPU time spent parsing a fetched document", ["parser"])
+
+# LLM
+LLM_REQUEST_SECONDS = Histogram("appgen_llm_request_seconds", "LLM API call latency", ["outcome"])
+LLM_TOKENS = Counter("appgen_llm_tokens_total", "Tokens reported by the LLM API", ["type"])
+LLM_CACHE = Counter("appgen_llm_cache_total", "LLM response cache lookups", ["result"])
+
+# Web
+SNAPSHOT_LOAD_SECONDS = Histogram("appgen_snapshot_load_seconds", "Time to load a snapshot from the store")
+SNAPSHOT_CACHE = Counter("appgen_snapshot_cache_total", "In-process snapshot cache lookups", ["result"])
+RENDER_SECONDS = Histogram("appgen_render_seconds", "Dashboard HTML render time", ["mode"])